@@ -1,9 +1,43 @@
 # config_manager.py
+import copy
+import functools
+import hashlib
 import json
+import atexit
 import os
+import queue
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# orjson is an optional, much faster drop-in for (de)serializing the config file.
+# Fall back to the stdlib json module when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 CONFIG_FILE_NAME = "app_config.json"
 
+# In-memory cache of the last config read from or written to disk.
+# Keyed on the file's (st_mtime_ns, st_size) so external edits still invalidate it.
+_cache_stat_key = None
+_cache_data = None
+_cache_task_index = {} # {task_id: list index} for _cache_data (first occurrence wins), for O(1) lookups
+_cache_generation = 0 # Bumped whenever _cache_data is replaced; see get_tasks_if_changed()
+# Digest of the bytes last written by save_config, used to skip no-op rewrites.
+_last_saved_digest = None
+
+# Background persistence: save_config(..., background=True) hands snapshots to a single
+# writer thread, which waits briefly and writes only the newest of any queued snapshots.
+_SAVE_DEBOUNCE_SECONDS = 0.2
+_save_queue = queue.Queue()
+_writer_thread = None
+_pending_saves = 0 # Snapshots queued but not yet written; the cache is newer than the file meanwhile
+_state_lock = threading.Lock() # Guards _writer_thread, _pending_saves and cache updates from background saves
+_write_lock = threading.Lock() # Serializes actual writes to the config file
+
 DEFAULT_CONFIG = {
     "gemini_api_key": "",
     "recipient_email": "",
@@ -23,6 +57,7 @@ DEFAULT_CONFIG = {
         # "interval": "1 day 07:00", # Parsable by scheduler.py
         # "search_internet": True,
         # "enabled": True, # To easily disable tasks without deleting
+        # "cache_ttl": 0, # Optional: seconds a Gemini response to the same prompt may be reused (0 = always ask)
         # "last_response": "", # Stores the latest Gemini response for this task
         # "last_sent_time": "" # Stores ISO formatted datetime string of the last successful send
         # }
@@ -39,8 +74,46 @@ def _ensure_task_fields(task_data):
         task_data["last_sent_time"] = ""
     return task_data
 
+def _deep_setdefaults(dst, src):
+    """
+    Fills keys missing from dst with (copies of) the values from src in a single pass,
+    recursing into nested dicts so sub-keys like smtp_settings.use_ssl are filled too.
+    """
+    for key, default_value in src.items():
+        if isinstance(default_value, dict):
+            nested = dst.setdefault(key, {})
+            if isinstance(nested, dict):
+                _deep_setdefaults(nested, default_value)
+        elif key not in dst:
+            dst[key] = copy.deepcopy(default_value)
+    return dst
+
+def _loads(raw_bytes):
+    """Parses config file bytes using orjson if available, otherwise stdlib json."""
+    if orjson is not None:
+        return orjson.loads(raw_bytes)
+    return json.loads(raw_bytes.decode('utf-8'))
+
+def _dumps(config_data):
+    """
+    Serializes config data to indented UTF-8 bytes using orjson if available, otherwise stdlib json.
+    The whole document is produced up front so it can be written with a single write() call
+    (json.dump would stream many small writes through the encoder instead).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(config_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        except TypeError: # orjson.JSONEncodeError: e.g. non-str keys or >64-bit ints, which json accepts
+            pass
+    return json.dumps(config_data, indent=2, sort_keys=True).encode('utf-8')
+
+@functools.lru_cache(maxsize=1)
 def get_config_path():
-    """Determines the path for the config file (e.g., in user's app data directory)."""
+    """
+    Determines the path for the config file (e.g., in user's app data directory).
+    The result is memoized, so any directory lookup/creation only happens once per process;
+    call get_config_path.cache_clear() if the location needs to be recomputed.
+    """
     # For simplicity, saving in the same directory as the script for now.
     # A more robust solution would use platform-specific directories:
     # For example, using appdirs library:
@@ -52,60 +125,140 @@ def get_config_path():
     return CONFIG_FILE_NAME
 
 
+def _stat_key(config_path):
+    """Returns a (mtime_ns, size) tuple identifying the current on-disk config, or None if missing."""
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _update_cache(config_path, config_data):
+    """
+    Remembers config_data as the current content of config_path. Tasks in the cached copy
+    get the same field migration load_config applies, so cache hits honour its contract.
+    """
+    global _cache_stat_key
+    _cache_stat_key = _stat_key(config_path)
+    if _cache_stat_key is None:
+        _set_cached_data(None)
+        return
+    _set_cached_data(copy.deepcopy(config_data))
+
+def _set_cached_data(config_data):
+    """Installs config_data (owned by the cache from now on) as the cached config and indexes its task IDs."""
+    global _cache_data, _cache_task_index, _cache_generation
+    _cache_generation += 1
+    if config_data is None:
+        _cache_data, _cache_task_index = None, {}
+        return
+    task_index = {}
+    for i, task in enumerate(config_data.get("scheduled_tasks", [])):
+        _ensure_task_fields(task)
+        if task.get("id"):
+            task_index.setdefault(task["id"], i)
+    _cache_data, _cache_task_index = config_data, task_index
+
+def invalidate_cache():
+    """Drops the in-memory config cache so the next load_config() re-reads the file."""
+    global _cache_stat_key, _last_saved_digest
+    _cache_stat_key = None
+    _set_cached_data(None)
+    _last_saved_digest = None
+
 def load_config():
-    """Loads configuration from the JSON file. Returns default config if file not found or invalid."""
+    """
+    Loads configuration from the JSON file. Returns default config if file not found or invalid.
+    If the file hasn't changed since it was last read or written, a copy of the cached
+    config (including background saves not yet written) is returned without touching the
+    file contents. If it was changed by someone else while a background save is pending,
+    the pending saves are written first and the file is read back, so the cache never
+    disagrees with what ends up on disk.
+    """
     config_path = get_config_path()
     try:
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
-                # Basic validation and migration for new fields
-                for key in DEFAULT_CONFIG:
-                    if key not in config_data:
-                        config_data[key] = DEFAULT_CONFIG[key]
-                    elif key == "smtp_settings": # Ensure all smtp_settings sub-keys are present
-                        for sub_key, default_value in DEFAULT_CONFIG["smtp_settings"].items():
-                            if sub_key not in config_data["smtp_settings"]:
-                               config_data["smtp_settings"][sub_key] = default_value
-                    elif key == "scheduled_tasks": # Ensure tasks have new fields
-                        config_data[key] = [_ensure_task_fields(task) for task in config_data[key]]
-
-                # Final check for smtp_settings if it existed but was missing newer sub-keys
-                if "smtp_settings" in config_data:
-                    for sub_key, default_value in DEFAULT_CONFIG["smtp_settings"].items():
-                        if sub_key not in config_data["smtp_settings"]:
-                            config_data["smtp_settings"][sub_key] = default_value
-
+        current_stat_key = _stat_key(config_path)
+        if current_stat_key is not None and current_stat_key == _cache_stat_key and _cache_data is not None:
+            return copy.deepcopy(_cache_data)
+        if _pending_saves:
+            flush()
+            current_stat_key = _stat_key(config_path)
+
+        if current_stat_key is not None:
+            with open(config_path, 'rb') as f:
+                config_data = _loads(f.read())
+                # Basic validation and migration for new fields (including missing smtp_settings sub-keys)
+                _deep_setdefaults(config_data, DEFAULT_CONFIG)
+                config_data["scheduled_tasks"] = [_ensure_task_fields(task) for task in config_data["scheduled_tasks"]]
+
+                _update_cache(config_path, config_data)
                 print(f"ConfigManager: Configuration loaded from {config_path}")
                 return config_data
         else:
             print(f"ConfigManager: Config file not found at {config_path}. Using default configuration (will be saved).")
             # For default config, ensure tasks also have the new fields if any are predefined (currently none)
             default_tasks_migrated = [_ensure_task_fields(task) for task in DEFAULT_CONFIG.get("scheduled_tasks", [])]
-            final_default_config = DEFAULT_CONFIG.copy()
+            final_default_config = copy.deepcopy(DEFAULT_CONFIG) # Don't share nested dicts with DEFAULT_CONFIG
             final_default_config["scheduled_tasks"] = default_tasks_migrated
             save_config(final_default_config)
             return final_default_config
-    except json.JSONDecodeError:
+    except ValueError: # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
         print(f"ConfigManager: Error decoding JSON from {config_path}. Using default configuration.")
+        invalidate_cache() # The cache no longer describes what load_config returns
         # Return a deep copy to prevent modification of the global DEFAULT_CONFIG
-        return json.loads(json.dumps(DEFAULT_CONFIG))
+        return copy.deepcopy(DEFAULT_CONFIG)
     except Exception as e:
         print(f"ConfigManager: An error occurred loading config: {e}. Using default configuration.")
+        invalidate_cache()
         # Return a deep copy to prevent modification of the global DEFAULT_CONFIG
-        return json.loads(json.dumps(DEFAULT_CONFIG))
+        return copy.deepcopy(DEFAULT_CONFIG)
 
-def save_config(config_data):
-    """Saves the given configuration data to the JSON file."""
-    config_path = get_config_path()
+def _atomic_write(config_path, data_bytes):
+    """
+    Writes data_bytes to a temporary file next to config_path and atomically swaps it in
+    with os.replace(), so a crash mid-write never leaves a truncated config behind.
+    """
+    tmp = tempfile.NamedTemporaryFile(mode='wb', dir=os.path.dirname(config_path) or '.',
+                                      prefix=os.path.basename(config_path) + '.', suffix='.tmp', delete=False)
+    try:
+        with tmp:
+            tmp.write(data_bytes) # One write of the pre-serialized buffer; large writes bypass the io buffer
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp.name, config_path)
+    except BaseException:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise
+
+def _write_config(config_path, config_data, refresh_cached_data=True):
+    """
+    Serializes and atomically writes config_data unless it is unchanged. Callers hold _write_lock.
+    With refresh_cached_data=False only the cache's stat key is refreshed, leaving the
+    (possibly newer) cached config from a later background save in place.
+    """
+    global _last_saved_digest, _cache_stat_key
     try:
         # Ensure the directory exists (important if using user_config_dir)
         # config_dir = os.path.dirname(config_path)
         # if not os.path.exists(config_dir):
         #     os.makedirs(config_dir, exist_ok=True)
 
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f, indent=4)
+        data_bytes = _dumps(config_data)
+        digest = hashlib.blake2b(data_bytes, digest_size=16).digest()
+        # Skip the write if we'd produce exactly what we last wrote and the file is still untouched.
+        if digest == _last_saved_digest and _cache_stat_key is not None and _stat_key(config_path) == _cache_stat_key:
+            print(f"ConfigManager: Configuration unchanged, skipping write to {config_path}")
+            return True
+
+        _atomic_write(config_path, data_bytes)
+        _last_saved_digest = digest
+        if refresh_cached_data:
+            _update_cache(config_path, config_data)
+        else:
+            _cache_stat_key = _stat_key(config_path)
         print(f"ConfigManager: Configuration saved to {config_path}")
         return True
     except IOError as e:
@@ -114,87 +267,235 @@ def save_config(config_data):
         print(f"ConfigManager: An unexpected error occurred while saving config: {e}")
     return False
 
+def _writer_loop():
+    """Body of the background writer thread: coalesces queued snapshots and writes the newest."""
+    global _pending_saves
+    while True:
+        config_data = _save_queue.get()
+        time.sleep(_SAVE_DEBOUNCE_SECONDS) # Let a burst of saves pile up
+        batch_size = 1
+        while True:
+            try:
+                config_data = _save_queue.get_nowait()
+                batch_size += 1
+            except queue.Empty:
+                break
+        try:
+            with _write_lock:
+                _write_config(get_config_path(), config_data, refresh_cached_data=False)
+        finally:
+            with _state_lock:
+                _pending_saves -= batch_size
+            for _ in range(batch_size):
+                _save_queue.task_done()
+
+def flush():
+    """Blocks until every background save queued so far has been written to disk."""
+    _save_queue.join()
+
+atexit.register(flush) # The writer is a daemon thread; don't lose a queued save at exit
+
+def save_config(config_data, background=False):
+    """
+    Saves the given configuration data to the JSON file (no-op if it is unchanged).
+
+    With background=True a snapshot is handed to the writer thread and the call returns
+    True immediately; load_config() serves the snapshot from memory until it is written
+    (unless the file is changed externally meanwhile, see load_config).
+    Use flush() to wait for pending background saves.
+    """
+    global _writer_thread, _pending_saves
+    if background:
+        snapshot = copy.deepcopy(config_data)
+        with _state_lock:
+            _set_cached_data(snapshot)
+            _pending_saves += 1
+            if _writer_thread is None or not _writer_thread.is_alive():
+                _writer_thread = threading.Thread(target=_writer_loop, name="ConfigWriter", daemon=True)
+                _writer_thread.start()
+        _save_queue.put(snapshot)
+        print("ConfigManager: Configuration queued for background save.")
+        return True
+
+    flush() # Don't let an older queued snapshot land on top of this write
+    with _write_lock:
+        return _write_config(get_config_path(), config_data)
+
 # --- Functions to manage specific parts of the config ---
 
+def _index_tasks(config):
+    """Returns a {task_id: list_index} map of config["scheduled_tasks"] (first occurrence wins)."""
+    task_index = {}
+    for i, task in enumerate(config.get("scheduled_tasks", [])):
+        task_index.setdefault(task.get("id"), i)
+    return task_index
+
+def _find_task(config, task_id):
+    """
+    Returns the list index of task_id in config["scheduled_tasks"], or None.
+    Tries the cached ID index first (configs from load_config are copies of the cache) and
+    checks the hit, falling back to a scan if the config has diverged from the cache.
+    """
+    tasks = config.get("scheduled_tasks", [])
+    idx = _cache_task_index.get(task_id)
+    if idx is not None and idx < len(tasks) and tasks[idx].get("id") == task_id:
+        return idx
+    return _index_tasks(config).get(task_id)
+
+class ConfigEdit:
+    """
+    Handle yielded by edit_config(). Mutate `config` in place and set `changed = True`
+    so the config is written back on exit; `saved` holds the save_config() result.
+    """
+    def __init__(self, config):
+        self.config = config
+        self.changed = False
+        self.saved = False
+
+@contextmanager
+def edit_config(background=False):
+    """
+    Loads the configuration once, yields a ConfigEdit for in-place mutation and saves
+    it once on exit (only if the block marked it as changed and didn't raise).
+    Lets several mutations share a single load/save round trip.
+    background is passed through to save_config().
+    """
+    edit = ConfigEdit(load_config())
+    yield edit
+    if edit.changed:
+        edit.saved = save_config(edit.config, background=background)
+
 def get_tasks():
-    config = load_config()
-    # Ensure all tasks have the new fields, even if loaded from an older config
-    # This is now handled in load_config, but an extra check here doesn't hurt for direct get_tasks calls.
-    return [_ensure_task_fields(task) for task in config.get("scheduled_tasks", [])]
+    """
+    Returns the list of scheduled tasks. load_config guarantees every task has the migrated fields.
+    On a cache hit only the task list is copied, not the whole config, since the GUI polls this
+    every second.
+    """
+    cached = _cache_data
+    if cached is not None and _stat_key(get_config_path()) == _cache_stat_key: # Includes pending background saves
+        return copy.deepcopy(cached.get("scheduled_tasks", []))
+    return load_config().get("scheduled_tasks", [])
+
+def get_tasks_if_changed(since_generation):
+    """
+    Like get_tasks(), for callers that keep their own copy of the tasks: returns
+    (tasks, generation), with tasks None if nothing changed since since_generation (the value
+    a previous call returned), which skips copying the task list. Pass None to always get tasks.
+    """
+    generation = _cache_generation # Read before the data: a concurrent swap then costs a copy, never an update
+    cached = _cache_data
+    if cached is None or _stat_key(get_config_path()) != _cache_stat_key:
+        return load_config().get("scheduled_tasks", []), generation
+    if generation == since_generation:
+        return None, generation
+    return copy.deepcopy(cached.get("scheduled_tasks", [])), generation
 
 def add_task_to_config(task_data):
     """Adds a single task to the configuration and saves it."""
-    config = load_config() # This will already have migrated tasks if loaded from file
-    if "scheduled_tasks" not in config:
-        config["scheduled_tasks"] = []
-    
-    # Basic check for existing ID to prevent duplicates, can be made more robust
-    existing_ids = {t.get("id") for t in config["scheduled_tasks"] if t.get("id")}
-    if task_data.get("id") and task_data["id"] in existing_ids:
-        print(f"ConfigManager: Task with ID '{task_data['id']}' already exists. Not adding.")
-        return False # Or update existing, depending on desired behavior
+    return add_tasks_to_config([task_data])
+
+def add_tasks_to_config(tasks_data):
+    """
+    Adds several tasks to the configuration with a single save.
+    Tasks whose ID already exists are skipped.
 
-    config["scheduled_tasks"].append(task_data)
-    return save_config(config)
+    Returns:
+        bool: True if at least one task was added and the config saved, False otherwise.
+    """
+    with edit_config() as edit:
+        config = edit.config # This will already have migrated tasks if loaded from file
+        if "scheduled_tasks" not in config:
+            config["scheduled_tasks"] = []
+
+        # Duplicate-ID check: load_config keeps _cache_task_index in step with the config it returns,
+        # so there's no need to rebuild an ID set from the task list on every add.
+        existing_ids = _cache_task_index if _cache_data is not None else {t.get("id") for t in config["scheduled_tasks"] if t.get("id")}
+        added_ids = set()
+        for task_data in tasks_data:
+            task_id = task_data.get("id")
+            if task_id and (task_id in existing_ids or task_id in added_ids):
+                print(f"ConfigManager: Task with ID '{task_id}' already exists. Not adding.")
+                continue # Or update existing, depending on desired behavior
+            config["scheduled_tasks"].append(task_data)
+            if task_id:
+                added_ids.add(task_id)
+            edit.changed = True
+    return edit.saved
 
 def update_task_in_config(task_id, updated_task_data):
     """Updates an existing task in the configuration by its ID."""
-    config = load_config() # Ensures tasks are migrated if loaded from an older config
-    task_found = False
-    for i, task in enumerate(config.get("scheduled_tasks", [])):
-        if task.get("id") == task_id:
+    return update_tasks_batch({task_id: updated_task_data})
+
+def update_tasks_batch(updates_by_id):
+    """
+    Replaces several tasks, given as {task_id: updated_task_data}, with a single save.
+
+    Returns:
+        bool: True if at least one task was found and the config saved, False otherwise.
+    """
+    with edit_config() as edit: # Ensures tasks are migrated if loaded from an older config
+        for task_id, updated_task_data in updates_by_id.items():
+            idx = _find_task(edit.config, task_id) # Tasks stay in place, so cached positions hold
+            if idx is None:
+                print(f"ConfigManager: Task with ID '{task_id}' not found for full update.")
+                continue
             # Ensure the updated data also has the new fields (last_response, last_sent_time)
             # This is important if updated_task_data comes from a source not aware of these fields.
-            config["scheduled_tasks"][i] = _ensure_task_fields(updated_task_data)
-            task_found = True
-            break
-    if task_found:
-        return save_config(config)
-    else:
-        print(f"ConfigManager: Task with ID '{task_id}' not found for full update.")
-        return False
+            edit.config["scheduled_tasks"][idx] = _ensure_task_fields(updated_task_data)
+            edit.changed = True
+    return edit.saved
 
-def update_task_last_run_details(task_id, last_response, last_sent_time_iso):
+def update_task_last_run_details(task_id, last_response, last_sent_time_iso, background=True):
     """
     Updates only the 'last_response' and 'last_sent_time' fields for a specific task
-    identified by its task_id. This is typically called by the scheduler after a task runs.
+    identified by its task_id. This is typically called by the scheduler after a task runs,
+    so by default the write is handed to the background writer thread (see save_config).
 
     Args:
         task_id (str): The unique ID of the task to update.
         last_response (str): The response content from the last execution.
         last_sent_time_iso (str): The ISO formatted datetime string of the last send.
+        background (bool): Queue the save instead of writing synchronously.
+
+    Returns:
+        bool: True if the task was found and config saved (or queued), False otherwise.
+    """
+    return bulk_update_last_run([(task_id, last_response, last_sent_time_iso)], background=background)
+
+def bulk_update_last_run(run_details, background=True):
+    """
+    Updates 'last_response' and 'last_sent_time' for several tasks with a single save.
+
+    Args:
+        run_details (list): (task_id, last_response, last_sent_time_iso) tuples.
+        background (bool): Queue the save instead of writing synchronously.
 
     Returns:
-        bool: True if the task was found and config saved, False otherwise.
+        bool: True if at least one task was found and config saved (or queued), False otherwise.
     """
-    config = load_config() # Ensures tasks are migrated if loaded from an older config
-    task_updated = False
-    for task in config.get("scheduled_tasks", []): # Iterate through tasks to find the one with matching ID
-        if task.get("id") == task_id:
+    with edit_config(background=background) as edit: # Ensures tasks are migrated if loaded from an older config
+        for task_id, last_response, last_sent_time_iso in run_details:
+            idx = _find_task(edit.config, task_id) # Tasks stay in place, so cached positions hold
+            if idx is None:
+                print(f"ConfigManager: Task with ID '{task_id}' not found for updating last run details.")
+                continue
+            task = edit.config["scheduled_tasks"][idx]
             task["last_response"] = last_response
             task["last_sent_time"] = last_sent_time_iso
-            task_updated = True
-            break # Found and updated the task, no need to continue loop
-
-    if task_updated:
-        return save_config(config) # Save the entire configuration with the updated task details
-    else:
-        print(f"ConfigManager: Task with ID '{task_id}' not found for updating last run details.")
-        return False
+            edit.changed = True
+    return edit.saved
 
 
 def remove_task_from_config(task_id):
     """Removes a task from the configuration by its ID."""
-    config = load_config()
-    initial_len = len(config.get("scheduled_tasks", []))
-    config["scheduled_tasks"] = [
-        task for task in config.get("scheduled_tasks", []) if task.get("id") != task_id
-    ]
-    if len(config.get("scheduled_tasks", [])) < initial_len:
-        return save_config(config)
-    else:
-        print(f"ConfigManager: Task with ID '{task_id}' not found for removal.")
-        return False
+    with edit_config() as edit:
+        idx = _find_task(edit.config, task_id)
+        if idx is not None:
+            del edit.config["scheduled_tasks"][idx]
+            edit.changed = True
+        else:
+            print(f"ConfigManager: Task with ID '{task_id}' not found for removal.")
+    return edit.saved
 
 if __name__ == '__main__':
     print("Testing ConfigManager...")
@@ -269,9 +570,16 @@ if __name__ == '__main__':
     print("\nAttempting to remove non-existent task:")
     remove_task_from_config("task_999")
 
+    print("\nBulk-updating last run details (single save):")
+    bulk_update_last_run([("task_001", "Bulk response", "2024-01-01T08:00:00"), ("task_999", "Ignored", "")])
+    tasks_after_bulk = get_tasks()
+    assert tasks_after_bulk[0]["last_response"] == "Bulk response"
+    assert tasks_after_bulk[0]["last_sent_time"] == "2024-01-01T08:00:00"
+
 
     # Test loading config with missing SMTP sub-keys (to test default filling)
     print("\n5. Testing config load with missing SMTP sub-keys:")
+    flush() # The bulk update above saved in the background; edit the file only once it's written
     if os.path.exists(test_config_path):
         with open(test_config_path, 'r')as f:
             temp_conf = json.load(f)
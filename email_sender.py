@@ -1,113 +1,786 @@
 # email_sender.py
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import collections
+import concurrent.futures
+import logging
+import queue
+import random
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# smtplib and the email package pull in dozens of submodules, so they are imported
+# lazily the first time an EmailSender is created rather than when this module loads.
+smtplib = None
+MIMEText = None
+MIMEMultipart = None
+
+# Only needed by AsyncEmailSender; aiosmtplib is an optional dependency.
+asyncio = None
+aiosmtplib = None
+
+def _load_mail_modules():
+    """Imports smtplib and the email.mime classes on first use."""
+    global smtplib, MIMEText, MIMEMultipart
+    if smtplib is None:
+        import smtplib as _smtplib
+        from email.mime.text import MIMEText as _MIMEText
+        from email.mime.multipart import MIMEMultipart as _MIMEMultipart
+        MIMEText, MIMEMultipart = _MIMEText, _MIMEMultipart
+        smtplib = _smtplib # Assigned last: it is the "already loaded" marker
+
+def _load_async_modules():
+    """Imports asyncio and aiosmtplib on first use. Raises ImportError if aiosmtplib is missing."""
+    global asyncio, aiosmtplib
+    if aiosmtplib is None:
+        import asyncio as _asyncio
+        try:
+            import aiosmtplib as _aiosmtplib
+        except ImportError:
+            raise ImportError("AsyncEmailSender requires the 'aiosmtplib' package (pip install aiosmtplib).") from None
+        asyncio, aiosmtplib = _asyncio, _aiosmtplib
+
+def _rset(conn):
+    """RSET after a failed transaction, ignoring a server that already hung up (as smtplib does)."""
+    try:
+        conn.rset()
+    except smtplib.SMTPServerDisconnected:
+        pass
+
+def _sendmail(conn, from_addr, recipients, payload):
+    """
+    conn.sendmail(from_addr, recipients, payload), but when the server advertises PIPELINING
+    (RFC 2920) MAIL FROM and every RCPT TO go out together and their replies are read
+    afterwards: one round trip instead of one per command, which smtplib waits for in turn.
+    Raises and returns exactly like smtplib.SMTP.sendmail.
+    """
+    conn.ehlo_or_helo_if_needed()
+    if not conn.has_extn("pipelining"):
+        return conn.sendmail(from_addr, recipients, payload)
+    size_option = " size=%d" % len(payload) if conn.has_extn("size") else ""
+    conn.putcmd("mail", "FROM:%s%s" % (smtplib.quoteaddr(from_addr), size_option))
+    for addr in recipients:
+        conn.putcmd("rcpt", "TO:%s" % smtplib.quoteaddr(addr))
+
+    code, resp = conn.getreply()
+    if code == 421: # Closing down; the RCPT replies will never come
+        conn.close()
+        raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+    refused = {}
+    for addr in recipients:
+        rcpt_code, rcpt_resp = conn.getreply()
+        if rcpt_code not in (250, 251):
+            refused[addr] = (rcpt_code, rcpt_resp)
+        if rcpt_code == 421:
+            conn.close()
+            raise smtplib.SMTPRecipientsRefused(refused)
+    if code != 250:
+        _rset(conn)
+        raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+    if len(refused) == len(recipients):
+        _rset(conn)
+        raise smtplib.SMTPRecipientsRefused(refused)
+
+    code, resp = conn.data(payload)
+    if code != 250:
+        if code == 421:
+            conn.close()
+        else:
+            _rset(conn)
+        raise smtplib.SMTPDataError(code, resp)
+    return refused
+
+class _BatchBreaker:
+    """
+    Circuit breaker for one batch send: trips once at least `min_attempts` messages were
+    tried and `failure_ratio` of them failed, since the rest of the batch is unlikely to
+    fare better against a wedged server. Safe to share between worker threads.
+    """
+    def __init__(self, min_attempts=30, failure_ratio=1 / 3):
+        self.min_attempts = min_attempts
+        self.failure_ratio = failure_ratio
+        self.attempted = 0
+        self.failures = 0
+        self._tripped = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def tripped(self):
+        return self._tripped.is_set()
+
+    def record(self, success):
+        with self._lock:
+            self.attempted += 1
+            if not success:
+                self.failures += 1
+            if (not self._tripped.is_set() and self.attempted >= self.min_attempts
+                    and self.failures >= self.failure_ratio * self.attempted):
+                logger.error("%s/%s sends failed. Aborting the rest of the batch.", self.failures, self.attempted)
+                self._tripped.set()
+
+class EmailMessage:
+    """
+    Subject and body of an outgoing email, validated once when created. payload() renders
+    it to the bytes handed to sendmail for a given sender and To header.
+
+    The MIME tree is rendered once per sender with a placeholder To header; later payload()
+    calls only splice the recipient into those bytes, so broadcasting the same newsletter
+    to many addresses doesn't re-encode the body each time.
+    """
+    _TO_PLACEHOLDER = "to-placeholder@invalid"
+
+    def __init__(self, subject, body_html, body_text=None):
+        if not body_html and not body_text: # Must have at least one body part
+            raise ValueError("Email body (HTML or text) is required.")
+        _load_mail_modules()
+        self.subject = subject
+        self.body_html = body_html
+        self.body_text = body_text
+        self._templates = {} # from_addr -> (bytes before To value, bytes after it)
+
+    def _render(self, from_addr, to_header):
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = self.subject
+        msg['From'] = from_addr
+        msg['To'] = to_header
+
+        if self.body_text:
+            part_text = MIMEText(self.body_text, 'plain')
+            msg.attach(part_text)
+
+        if self.body_html:
+            part_html = MIMEText(self.body_html, 'html')
+            msg.attach(part_html)
+
+        return msg.as_bytes() # smtplib sends bytes as-is; a str would be re-encoded per sendmail
+
+    def payload(self, from_addr, to_header):
+        """Returns the message serialized to bytes with the given From and To headers."""
+        # Non-ASCII or long headers need RFC 2047 encoding/folding, so render those in full.
+        if not to_header.isascii() or len(to_header) > 900 or "\n" in to_header or "\r" in to_header:
+            return self._render(from_addr, to_header)
+        template = self._templates.get(from_addr)
+        if template is None:
+            head, _, tail = self._render(from_addr, self._TO_PLACEHOLDER).partition(self._TO_PLACEHOLDER.encode())
+            template = self._templates[from_addr] = (head, tail)
+        return template[0] + to_header.encode('ascii') + template[1]
 
 class EmailSender:
-    def __init__(self, smtp_server, smtp_port, smtp_user, smtp_password, use_tls=True, use_ssl=False):
+    MESSAGE_CACHE_SIZE = 32 # Distinct (subject, body) templates kept by _build_message
+    # Reply codes meaning "try again later" (service closing channel, local error in processing).
+    TRANSIENT_SMTP_CODES = (421, 451)
+
+    def __init__(self, smtp_server, smtp_port, smtp_user, smtp_password, use_tls=True, use_ssl=False, persistent=False,
+                 max_per_connection=1000, max_retries=3, backoff_base=2.0, backoff_jitter=1.0,
+                 connect_timeout=30, io_timeout=60, max_idle_seconds=120, dns_ttl=900, max_deadletter=100):
+        if not all([smtp_server, smtp_port, smtp_user, smtp_password]):
+            raise ValueError("SMTP configuration is incomplete: server, port, user and password are required.")
+        _load_mail_modules()
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.smtp_user = smtp_user
         self.smtp_password = smtp_password # Should be handled securely
         self.use_tls = use_tls # For STARTTLS
         self.use_ssl = use_ssl # For direct SSL connection
+        # In persistent mode one authenticated connection is kept open and reused across
+        # send_email calls (checked with NOOP, reopened lazily). Call close() when done.
+        # Using the sender as a context manager turns this on for the duration of the block.
+        self.persistent = persistent
+        self._conn = None
+        self._persistent_outside_with = persistent
+        # Providers cap messages per session (e.g. 421 errors), so a reused connection is
+        # rotated after this many successful sends.
+        self.max_per_connection = max_per_connection
+        self._sent_on_conn = 0
+        # Transient failures (disconnects, refused/failed connections, network errors) are retried
+        # with exponential backoff: max_retries total attempts, sleeping backoff_base * 2**n + jitter.
+        self.max_retries = max(1, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_jitter = backoff_jitter
+        # Without explicit timeouts a half-dead server can hang a send indefinitely.
+        # A reused connection idle for longer than max_idle_seconds is reopened rather than trusted.
+        self.connect_timeout = connect_timeout
+        self.io_timeout = io_timeout
+        self.max_idle_seconds = max_idle_seconds
+        self._last_success_ts = 0.0
+        # smtp_server is resolved on first connect and its addresses cached for dns_ttl seconds
+        # (or until none of them accepts a connection), so reconnects skip the getaddrinfo round trip.
+        self.dns_ttl = dns_ttl
+        self._resolved_addrs = None
+        self._resolved_at = 0.0
+        self._message_cache = {}
+        # Messages that still failed after reconnecting/retrying, as (recipients, payload) pairs.
+        # Inspect them or resend with flush_deadletter() once the server has recovered. Only the
+        # latest max_deadletter are kept (each holds a full message), and 0 keeps none: for
+        # long-lived senders whose callers record failures themselves and never flush.
+        self.max_deadletter = max(0, max_deadletter)
+        self.deadletter = collections.deque(maxlen=self.max_deadletter)
+        self._deadletter_lock = threading.Lock()
 
         if self.use_ssl and self.use_tls:
             # It's generally one or the other. Direct SSL implies TLS from the start.
             # STARTTLS upgrades a plain connection. For clarity, ensure only one is primary.
             # We'll prioritize direct SSL if both are somehow true.
-            print(f"EmailSender WARNING: Both use_ssl and use_tls are True. Prioritizing direct SSL.")
+            logger.warning("Both use_ssl and use_tls are True. Prioritizing direct SSL.")
             self.use_tls = False # Disable STARTTLS if direct SSL is active
 
         security_mode = "Direct SSL" if self.use_ssl else ("STARTTLS" if self.use_tls else "None")
-        print(f"EmailSender initialized for {smtp_user}@{smtp_server}:{smtp_port} (Security: {security_mode})")
+        logger.info("EmailSender initialized for %s@%s:%s (Security: %s)", smtp_user, smtp_server, smtp_port, security_mode)
+
+    def __enter__(self):
+        """Reuses one SMTP session for every send inside the with-block."""
+        self._persistent_outside_with = self.persistent
+        self.persistent = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        self.persistent = self._persistent_outside_with
+        return False
+
+    def _resolve_server(self):
+        """
+        Returns the cached (family, sockaddr) pairs for smtp_server, in getaddrinfo order,
+        re-resolving them once dns_ttl has passed.
+        """
+        now = time.monotonic()
+        if self._resolved_addrs is None or now - self._resolved_at > self.dns_ttl:
+            addr_info = socket.getaddrinfo(self.smtp_server, self.smtp_port, type=socket.SOCK_STREAM)
+            self._resolved_addrs = [(family, sockaddr) for family, _, _, _, sockaddr in addr_info]
+            self._resolved_at = now
+        return self._resolved_addrs
+
+    def _open_smtp(self, ssl):
+        """Creates a raw SMTP (or SMTP_SSL) connection with the connect and read/write timeouts applied."""
+        smtp_class = smtplib.SMTP_SSL if ssl else smtplib.SMTP
+        server = smtp_class(timeout=self.connect_timeout) # No host given: nothing is connected yet
+
+        # Connect the socket to the cached addresses while smtplib keeps the real hostname
+        # for TLS SNI/certificate checks (SMTP_SSL.connect and starttls() both use server._host).
+        # Like socket.create_connection, each address is tried in turn, so an unreachable first
+        # one (e.g. IPv6 without a route) falls through to the next.
+        resolved_addrs = self._resolve_server()
+        get_socket = server._get_socket
+
+        def get_cached_socket(host, port, timeout):
+            error = None
+            for _, sockaddr in resolved_addrs:
+                try:
+                    return get_socket(sockaddr[0], port, timeout)
+                except OSError as e:
+                    error = e
+            raise error if error is not None else OSError(f"No addresses found for {host}")
+
+        server._get_socket = get_cached_socket
+        try:
+            code, message = server.connect(self.smtp_server, self.smtp_port)
+        except OSError:
+            self._resolved_addrs = None # Every address failed and may be stale; resolve again next time
+            raise
+        if code != 220:
+            server.close()
+            raise smtplib.SMTPConnectError(code, message)
+
+        sock = getattr(server, "sock", None)
+        if sock is not None and self.io_timeout:
+            sock.settimeout(self.io_timeout) # STARTTLS wraps this socket and keeps its timeout
+        return server
+
+    def _connect(self):
+        """Opens a new SMTP connection, secures it (SSL or STARTTLS) and logs in."""
+        connection_details = f"{self.smtp_server}:{self.smtp_port}"
+        if self.use_ssl:
+            logger.debug("Opening reusable SMTP_SSL session with %s", connection_details)
+            server = self._open_smtp(ssl=True)
+        else:
+            logger.debug("Opening reusable SMTP session with %s", connection_details)
+            server = self._open_smtp(ssl=False)
+            if self.use_tls:
+                logger.debug("Upgrading to STARTTLS for %s", connection_details)
+                server.starttls()
+        server.login(self.smtp_user, self.smtp_password)
+        return server
+
+    def _get_conn(self):
+        """Returns the cached connection if it still answers NOOP, otherwise opens a new one."""
+        if self._conn is not None:
+            if self.max_idle_seconds and time.monotonic() - self._last_success_ts > self.max_idle_seconds:
+                logger.debug("Persistent connection idle for over %ss. Reconnecting.", self.max_idle_seconds)
+                self.close()
+            else:
+                try:
+                    if self._conn.noop()[0] == 250:
+                        return self._conn
+                except (smtplib.SMTPException, OSError):
+                    pass
+                logger.debug("Persistent connection is no longer usable. Reconnecting.")
+                self.close()
+        self._conn = self._connect()
+        self._sent_on_conn = 0
+        self._last_success_ts = time.monotonic()
+        return self._conn
+
+    def _record_sent(self):
+        """Counts a message sent on the reused connection and rotates it once the cap is reached."""
+        self._sent_on_conn += 1
+        self._last_success_ts = time.monotonic()
+        if self.max_per_connection and self._sent_on_conn >= self.max_per_connection:
+            logger.debug("Sent %s messages on this connection (cap %s). Rotating connection.", self._sent_on_conn, self.max_per_connection)
+            self.close()
+
+    def close(self):
+        """Closes the persistent connection, if one is open."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.quit()
+        except (smtplib.SMTPException, OSError):
+            pass # Connection already dropped; nothing else to clean up
+        self._conn = None
+        self._sent_on_conn = 0
+
+    def is_idle(self):
+        """True if the persistent connection is open but unused for longer than max_idle_seconds. No I/O."""
+        return (self._conn is not None and bool(self.max_idle_seconds)
+                and time.monotonic() - self._last_success_ts > self.max_idle_seconds)
+
+    def close_if_idle(self):
+        """Closes the persistent connection if it has sat unused for longer than max_idle_seconds."""
+        if self.is_idle():
+            logger.debug("Closing persistent connection idle for over %ss.", self.max_idle_seconds)
+            self.close()
+
+    def _is_transient(self, error):
+        """True for failures worth a reconnect and retry: a dropped session, a 421/451 reply or a network error."""
+        if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code in self.TRANSIENT_SMTP_CODES
+        return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+    def _backoff_delay(self, attempt):
+        return self.backoff_base * (2 ** (attempt - 1)) + random.random() * self.backoff_jitter
+
+    def _add_deadletter(self, recipients, payload):
+        if not self.max_deadletter:
+            return
+        with self._deadletter_lock:
+            self.deadletter.append((list(recipients), payload))
+
+    def flush_deadletter(self, workers=1):
+        """
+        Resends every message in the dead-letter list. Messages that fail again are put back.
+
+        Returns:
+            int: Number of messages delivered.
+        """
+        with self._deadletter_lock:
+            pending, self.deadletter = list(self.deadletter), collections.deque(maxlen=self.max_deadletter)
+        if not pending:
+            return 0
+        jobs = [(index, recipients, payload) for index, (recipients, payload) in enumerate(pending)]
+        delivered = sum(self._run_workers(jobs, workers).values())
+        logger.info("Dead-letter flush delivered %s/%s emails.", delivered, len(pending))
+        return delivered
+
+    def _build_message(self, subject, body_html, body_text, to_header):
+        """
+        Returns the message serialized to bytes, or None if neither an HTML nor a text body
+        was given. Callers serialize once and pass the same payload to every delivery
+        attempt/recipient. Recently used subjects/bodies keep their rendered EmailMessage,
+        so repeated sends of the same content only swap the To header.
+        """
+        key = (subject, body_html, body_text)
+        message = self._message_cache.get(key)
+        if message is None:
+            try:
+                message = EmailMessage(subject, body_html, body_text)
+            except ValueError as e:
+                logger.error("%s", e)
+                return None
+            if len(self._message_cache) >= self.MESSAGE_CACHE_SIZE:
+                self._message_cache.pop(next(iter(self._message_cache)), None)
+            self._message_cache[key] = message
+        return message.payload(self.smtp_user, to_header)
+
+    def _deliver(self, recipients, payload):
+        """Delivers an already-serialized payload once; raises on any SMTP/network error."""
+        if self.persistent:
+            try:
+                _sendmail(self._get_conn(), self.smtp_user, recipients, payload)
+            except Exception:
+                self.close() # Don't reuse a connection left in an unknown state
+                raise
+            self._record_sent()
+            return
+
+        connection_details = f"{self.smtp_server}:{self.smtp_port}"
+        if self.use_ssl:
+            logger.debug("Establishing SMTP_SSL session with %s", connection_details)
+            with self._open_smtp(ssl=True) as server_ssl:
+                # No server.starttls() here as it's SSL from the start
+                server_ssl.login(self.smtp_user, self.smtp_password)
+                _sendmail(server_ssl, self.smtp_user, recipients, payload)
+        else: # Standard SMTP, possibly with STARTTLS
+            logger.debug("Establishing SMTP session with %s", connection_details)
+            with self._open_smtp(ssl=False) as server_std:
+                if self.use_tls:
+                    logger.debug("Upgrading to STARTTLS for %s", connection_details)
+                    server_std.starttls()
+                server_std.login(self.smtp_user, self.smtp_password)
+                _sendmail(server_std, self.smtp_user, recipients, payload)
 
     def send_email(self, to_email, subject, body_html, body_text=None):
         """
         Sends an email.
-        to_email: Recipient's email address.
+        to_email: Recipient's email address, or a list of addresses (sent in one transaction).
         subject: Subject of the email.
         body_html: HTML content of the email.
         body_text: Plain text version of the email (optional, good for compatibility).
         """
-        if not all([self.smtp_server, self.smtp_port, self.smtp_user, self.smtp_password]):
-            print("EmailSender Error: SMTP configuration is incomplete. Cannot send email.")
-            # In a real app, this might raise an error or return a specific status
+        recipients = [to_email] if isinstance(to_email, str) else list(to_email)
+        to_email = ", ".join(recipients)
+        payload = self._build_message(subject, body_html, body_text, to_email)
+        if payload is None:
             return False
 
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = self.smtp_user
-        msg['To'] = to_email
+        for attempt in range(1, self.max_retries + 1):
+            retryable = False
+            try:
+                self._deliver(recipients, payload)
+                logger.info("Email sent successfully to %s with subject '%s'", to_email, subject)
+                return True
 
-        if body_text:
-            part_text = MIMEText(body_text, 'plain')
-            msg.attach(part_text)
-        
-        if body_html:
-            part_html = MIMEText(body_html, 'html')
-            msg.attach(part_html)
-        elif not body_text: # Must have at least one body part
-             print("EmailSender Error: Email body (HTML or text) is required.")
-             return False
+            except smtplib.SMTPAuthenticationError as e:
+                logger.error("SMTP Authentication failed for user %s. Check credentials. Error: %s", self.smtp_user, e)
+            except smtplib.SMTPRecipientsRefused as e:
+                logger.error("All recipients were refused by the server: %s. Error: %s", to_email, e)
+            except smtplib.SMTPServerDisconnected as e:
+                retryable = True
+                logger.error("SMTP server disconnected. Check server address/port or network. Error: %s", e)
+            except smtplib.SMTPConnectError as e:
+                retryable = True
+                logger.error("Could not connect to SMTP server %s:%s. Error: %s", self.smtp_server, self.smtp_port, e)
+            except smtplib.SMTPResponseException as e: # Sender refused, data error, ... -- retried only for 421/451
+                retryable = e.smtp_code in self.TRANSIENT_SMTP_CODES
+                logger.error("SMTP server rejected the message: %s - %s", type(e).__name__, e)
+            except smtplib.SMTPException as e: # Other protocol-level rejections
+                logger.error("SMTP server rejected the message: %s - %s", type(e).__name__, e)
+            except ConnectionRefusedError as e: # More specific than just SMTPConnectError for some cases
+                retryable = True
+                logger.error("Connection refused by server %s:%s. Check firewall or if server is running. Error: %s", self.smtp_server, self.smtp_port, e)
+            except OSError as e: # Catches errors like [Errno 11001] getaddrinfo failed
+                retryable = True
+                logger.error("OS error while connecting to %s:%s. Could be DNS issue or network problem. Error: %s", self.smtp_server, self.smtp_port, e)
+            except Exception as e:
+                logger.error("An unexpected error occurred while sending email: %s - %s", type(e).__name__, e)
+
+            if not retryable:
+                break
+            if attempt >= self.max_retries:
+                self._add_deadletter(recipients, payload) # Transient to the end; worth resending later
+                break
+            delay = self._backoff_delay(attempt)
+            logger.warning("Transient failure (attempt %s/%s). Retrying in %.1fs.", attempt, self.max_retries, delay)
+            time.sleep(delay)
+        return False
 
+    def send_bulk(self, to_emails, subject, body_html, body_text=None, workers=1):
+        """
+        Sends the same email separately to each address in to_emails.
+        The message is built and serialized once and delivered over a single connection
+        (the persistent one if enabled, otherwise one opened just for this batch).
+        With workers > 1 the recipients are instead spread over that many threads, each
+        with its own session, so network round trips overlap (smtplib releases the GIL
+        while waiting on the socket). Recipients are not disclosed to each other.
+
+        Returns:
+            dict: {address: bool} with the delivery result for each recipient. If the batch is
+                  aborted by the circuit breaker, unattempted recipients stay False so the
+                  caller can requeue every address that isn't True.
+        """
+        results = {addr: False for addr in to_emails}
+        payload = self._build_message(subject, body_html, body_text, "undisclosed-recipients:;")
+        if payload is None:
+            return results
 
+        if workers > 1:
+            results.update(self._run_workers([(addr, [addr], payload) for addr in results], workers))
+            logger.info("Bulk send of '%s' delivered to %s/%s recipients using up to %s session(s).",
+                        subject, sum(results.values()), len(results), workers)
+            return results
+
+        breaker = _BatchBreaker()
         try:
-            connection_details = f"{self.smtp_server}:{self.smtp_port}"
-            server = None # Initialize server variable
+            for addr in to_emails:
+                if breaker.tripped:
+                    break
+                for attempt in (1, 2):
+                    try:
+                        _sendmail(self._get_conn(), self.smtp_user, [addr], payload)
+                        results[addr] = True
+                        self._record_sent()
+                    except smtplib.SMTPRecipientsRefused as e:
+                        logger.error("Recipient %s refused by server. Error: %s", addr, e)
+                    except Exception as e:
+                        self.close() # Reconnect for the retry / next recipient
+                        if attempt == 1 and self._is_transient(e):
+                            logger.warning("Session lost while sending to %s (%s). Reconnecting and retrying.", addr, e)
+                            time.sleep(self._backoff_delay(1))
+                            continue
+                        logger.error("Failed to send email to %s: %s - %s", addr, type(e).__name__, e)
+                        if self._is_transient(e):
+                            self._add_deadletter([addr], payload)
+                    break
+                breaker.record(results[addr])
+        finally:
+            if not self.persistent:
+                self.close()
 
-            if self.use_ssl:
-                print(f"EmailSender: Attempting SSL connection to {connection_details}")
-                server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port)
-            else:
-                print(f"EmailSender: Attempting non-SSL connection to {connection_details}")
-                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                if self.use_tls:
-                    print(f"EmailSender: Securing connection with STARTTLS for {connection_details}")
-                    server.starttls() # Secure the connection
-
-            # Login and send regardless of connection type (SSL or STARTTLS)
-            # No need for 'with' statement if we manually quit, or ensure it's handled.
-            # For simplicity, let's ensure server.quit() is called in a finally block or rely on 'with' if possible.
-            # The 'with' statement is cleaner if SMTP_SSL also supports it directly.
-            # SMTP_SSL objects don't need starttls(). They are secure from the start.
-
-            # Re-evaluating the 'with' block:
-            # smtplib.SMTP and smtplib.SMTP_SSL can both be used as context managers.
-
-            if self.use_ssl:
-                print(f"EmailSender: Establishing SMTP_SSL session with {connection_details}")
-                with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port) as server_ssl:
-                    # No server.starttls() here as it's SSL from the start
-                    server_ssl.login(self.smtp_user, self.smtp_password)
-                    server_ssl.sendmail(self.smtp_user, to_email, msg.as_string())
-            else: # Standard SMTP, possibly with STARTTLS
-                print(f"EmailSender: Establishing SMTP session with {connection_details}")
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server_std:
-                    if self.use_tls:
-                        print(f"EmailSender: Upgrading to STARTTLS for {connection_details}")
-                        server_std.starttls()
-                    server_std.login(self.smtp_user, self.smtp_password)
-                    server_std.sendmail(self.smtp_user, to_email, msg.as_string())
-
-            print(f"EmailSender SUCCESS: Email sent successfully to {to_email} with subject '{subject}'")
-            return True
+        sent_count = sum(results.values())
+        logger.info("Bulk send of '%s' delivered to %s/%s recipients.", subject, sent_count, len(results))
+        return results
 
-        except smtplib.SMTPAuthenticationError as e:
-            print(f"EmailSender ERROR: SMTP Authentication failed for user {self.smtp_user}. Check credentials. Error: {e}")
-        except smtplib.SMTPServerDisconnected as e:
-            print(f"EmailSender ERROR: SMTP server disconnected. Check server address/port or network. Error: {e}")
-        except smtplib.SMTPConnectError as e:
-            print(f"EmailSender ERROR: Could not connect to SMTP server {self.smtp_server}:{self.smtp_port}. Error: {e}")
-        except ConnectionRefusedError as e: # More specific than just SMTPConnectError for some cases
-            print(f"EmailSender ERROR: Connection refused by server {self.smtp_server}:{self.smtp_port}. Check firewall or if server is running. Error: {e}")
-        except OSError as e: # Catches errors like [Errno 11001] getaddrinfo failed
-             print(f"EmailSender ERROR: OS error while connecting to {self.smtp_server}:{self.smtp_port}. Could be DNS issue or network problem. Error: {e}")
+    def send_to_recipients(self, recipients, subject, body_html, body_text=None):
+        """
+        Sends one copy of an email to many recipients (BCC-style) in a single SMTP transaction:
+        one MAIL FROM and one DATA for the whole list, instead of one full transaction each.
+        Recipients are not disclosed to each other.
+
+        Returns:
+            dict: {address: bool}; addresses the server refused are False.
+        """
+        results = {addr: False for addr in recipients}
+        if not recipients:
+            return results
+        payload = self._build_message(subject, body_html, body_text, "undisclosed-recipients:;")
+        if payload is None:
+            return results
+
+        try:
+            refused = _sendmail(self._get_conn(), self.smtp_user, list(recipients), payload)
+            self._record_sent()
+            for addr in recipients:
+                results[addr] = addr not in refused
+            if refused:
+                logger.warning("Server refused %s recipient(s): %s", len(refused), ', '.join(refused))
+        except smtplib.SMTPRecipientsRefused as e:
+            logger.error("All recipients were refused by the server. Error: %s", e)
         except Exception as e:
-            print(f"EmailSender ERROR: An unexpected error occurred while sending email: {type(e).__name__} - {e}")
+            logger.error("Failed to send email to %s recipients: %s - %s", len(recipients), type(e).__name__, e)
+            self.close()
+        finally:
+            if not self.persistent:
+                self.close()
+
+        logger.info("Multi-recipient send of '%s' accepted for %s/%s recipients.", subject, sum(results.values()), len(results))
+        return results
+
+    def _run_workers(self, jobs, workers):
+        """
+        Delivers (key, recipients, payload) jobs from a shared queue using `workers` threads.
+        Each thread owns its own SMTP session (smtplib sessions aren't thread-safe), reuses it
+        for consecutive jobs and rotates it after max_per_connection sends. Workers stop
+        taking jobs once the batch's circuit breaker trips.
+
+        Returns:
+            dict: {key: bool} delivery result per job (False also for jobs never attempted).
+        """
+        job_queue = queue.Queue()
+        for job in jobs:
+            job_queue.put(job)
+        results = {key: False for key, _, _ in jobs}
+        breaker = _BatchBreaker()
+
+        def worker():
+            conn, sent_on_conn = None, 0
+            try:
+                while not breaker.tripped:
+                    try:
+                        key, recipients, payload = job_queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    for attempt in (1, 2):
+                        try:
+                            if conn is None:
+                                conn, sent_on_conn = self._connect(), 0
+                            _sendmail(conn, self.smtp_user, recipients, payload)
+                            results[key] = True
+                            sent_on_conn += 1
+                            if self.max_per_connection and sent_on_conn >= self.max_per_connection:
+                                conn.quit()
+                                conn = None
+                        except Exception as e:
+                            if conn is not None:
+                                conn.close() # Retry / start the next job on a fresh session
+                                conn = None
+                            if results[key]:
+                                break # Delivered; only the rotation QUIT failed
+                            if attempt == 1 and self._is_transient(e):
+                                logger.warning("Session lost while sending to %s (%s). Reconnecting and retrying.", ', '.join(recipients), e)
+                                time.sleep(self._backoff_delay(1))
+                                continue
+                            logger.error("Failed to send email to %s: %s - %s", ', '.join(recipients), type(e).__name__, e)
+                            if self._is_transient(e):
+                                self._add_deadletter(recipients, payload)
+                        break
+                    breaker.record(results[key])
+            finally:
+                if conn is not None:
+                    try:
+                        conn.quit()
+                    except (smtplib.SMTPException, OSError):
+                        conn.close()
+
+        pool_size = max(1, min(workers, len(jobs)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="EmailSender") as executor:
+            for future in [executor.submit(worker) for _ in range(pool_size)]:
+                future.result()
+        return results
+
+    def send_many(self, messages, workers=4):
+        """
+        Sends several different emails concurrently over a pool of `workers` SMTP sessions.
+
+        Args:
+            messages (list): (to_email, subject, body_html, body_text) tuples.
+            workers (int): Number of parallel sessions/threads.
+
+        Returns:
+            list: A bool per message, in the same order, True if it was delivered.
+        """
+        if not messages:
+            return []
+        jobs = []
+        for index, (to_email, subject, body_html, body_text) in enumerate(messages):
+            payload = self._build_message(subject, body_html, body_text, to_email)
+            if payload is not None:
+                jobs.append((index, [to_email], payload))
+
+        results = self._run_workers(jobs, workers) if jobs else {}
+        delivered = [results.get(index, False) for index in range(len(messages))]
+        logger.info("Concurrent batch delivered %s/%s emails using up to %s session(s).", sum(delivered), len(delivered), workers)
+        return delivered
+
+class AsyncEmailSender(EmailSender):
+    """
+    asyncio variant of EmailSender built on aiosmtplib (optional dependency).
+    asend() keeps one long-lived session open across awaits (close it with aclose() or
+    `async with`), so an event loop never blocks on SMTP and repeated sends skip the
+    TLS/AUTH handshake. asend_many() spreads a batch of messages over a small pool of
+    concurrent SMTP connections so network round trips overlap instead of running back to back.
+    The coroutines are "a"-prefixed, so the synchronous EmailSender methods (send_email,
+    send_many, ...) remain available on instances.
+    """
+    def __init__(self, *args, max_connections=3, **kwargs):
+        _load_async_modules()
+        super().__init__(*args, **kwargs)
+        self.max_connections = max(1, max_connections)
+        self._async_conn = None
+        self._async_lock = None # Created on first use, inside the running event loop
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        await self.aclose()
         return False
 
+    async def _connect_async(self):
+        """Opens, secures and authenticates a new aiosmtplib connection."""
+        smtp = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port,
+                               use_tls=self.use_ssl, start_tls=self.use_tls, timeout=self.connect_timeout)
+        await smtp.connect()
+        await smtp.login(self.smtp_user, self.smtp_password)
+        return smtp
+
+    async def aclose(self):
+        """Closes the long-lived session used by asend(), if one is open."""
+        conn, self._async_conn = self._async_conn, None
+        if conn is None:
+            return
+        try:
+            await conn.quit()
+        except Exception:
+            conn.close() # Already dropped; just release the transport
+
+    async def asend(self, to_email, subject, body_html, body_text=None):
+        """
+        Sends a single email asynchronously over the long-lived session, (re)connecting if needed.
+        Returns True on success, False otherwise.
+        """
+        payload = self._build_message(subject, body_html, body_text, to_email)
+        if payload is None:
+            return False
+
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock: # One SMTP transaction at a time on the shared session
+            try:
+                if self._async_conn is None or not self._async_conn.is_connected:
+                    self._async_conn = await self._connect_async()
+                await self._async_conn.sendmail(self.smtp_user, [to_email], payload)
+                logger.info("Email sent successfully to %s with subject '%s'", to_email, subject)
+                return True
+            except Exception as e:
+                logger.error("Async send to %s failed: %s - %s", to_email, type(e).__name__, e)
+                await self.aclose() # Reconnect on the next send
+                return False
+
+    async def asend_many(self, messages, workers=None):
+        """
+        Sends several emails concurrently.
+
+        Args:
+            messages (list): (to_email, subject, body_html, body_text) tuples.
+            workers (int): Concurrent connections to use (defaults to max_connections).
+
+        Returns:
+            list: A bool per message, in the same order, True if it was delivered.
+        """
+        results = [False] * len(messages)
+        if not messages:
+            return results
+        queue = asyncio.Queue()
+        for index, message in enumerate(messages):
+            queue.put_nowait((index, message))
+
+        async def worker():
+            smtp = None
+            try:
+                while True:
+                    try:
+                        index, (to_email, subject, body_html, body_text) = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    payload = self._build_message(subject, body_html, body_text, to_email)
+                    if payload is None:
+                        continue
+                    try:
+                        if smtp is None:
+                            smtp = await self._connect_async()
+                        await smtp.sendmail(self.smtp_user, [to_email], payload)
+                        results[index] = True
+                    except Exception as e:
+                        logger.error("Async send to %s failed: %s - %s", to_email, type(e).__name__, e)
+                        if smtp is not None:
+                            smtp.close() # Drop the connection; the next message reconnects
+                            smtp = None
+            finally:
+                if smtp is not None:
+                    try:
+                        await smtp.quit()
+                    except Exception:
+                        smtp.close()
+
+        pool_size = min(workers or self.max_connections, len(messages))
+        await asyncio.gather(*(worker() for _ in range(pool_size)))
+        logger.info("Async batch delivered %s/%s emails over %s connection(s).", sum(results), len(results), pool_size)
+        return results
+
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(name)s %(levelname)s: %(message)s")
     print("Testing EmailSender...")
     
     # --- IMPORTANT ---
@@ -1,46 +1,170 @@
 # gemini_client.py
+import asyncio
+import hashlib
+import logging
 import time
 import google.generativeai as genai
 import traceback
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Only needed by AsyncGeminiClient; httpx is an optional dependency.
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = 'models/gemini-2.0-flash'
+GENERATE_CONTENT_URL = "https://generativelanguage.googleapis.com/v1beta/{model}:generateContent"
+
+# Successful responses keyed by (sha256(api_key), model_name, prompt), shared by all clients in
+# the process. Entries expire after _RESPONSE_CACHE_TTL seconds; the least recently used are
+# evicted first. search_internet answers are never cached, so they stay current.
+_RESPONSE_CACHE_MAXSIZE = 1024
+_RESPONSE_CACHE_TTL = 3600
+_response_cache = OrderedDict() # {key: (stored at, expires at, text), both on time.monotonic()}
+_response_cache_lock = threading.Lock()
+
+def _get_cached_response(key, max_age=None):
+    """Returns the cached text for key, or None if absent, expired or older than max_age seconds."""
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now > entry[1]:
+            del _response_cache[key]
+            return None
+        if max_age is not None and now - entry[0] > max_age:
+            return None # Too old for this caller, though still fresh enough for others
+        _response_cache.move_to_end(key)
+        return entry[2]
+
+def _cache_response(key, text, ttl=_RESPONSE_CACHE_TTL):
+    with _response_cache_lock:
+        now = time.monotonic()
+        _response_cache[key] = (now, now + ttl, text)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _RESPONSE_CACHE_MAXSIZE:
+            _response_cache.popitem(last=False)
+
+def _resolve_cache_ttl(search_internet, cache_ttl):
+    """Seconds a response may be reused for: never for search_internet, else cache_ttl (None = default)."""
+    if search_internet:
+        return 0
+    return _RESPONSE_CACHE_TTL if cache_ttl is None else cache_ttl
+
+def clear_response_cache():
+    """Drops all cached Gemini responses."""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+# get_gemini_response calls underway, as {cache key: Future of the response}, so identical
+# prompts sent at the same time (e.g. tasks due together) make a single API call
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+class GeminiStreamError(RuntimeError):
+    """Raised by stream_gemini_response when the stream fails after some text was already yielded."""
 
 # Placeholder for actual Gemini API interaction
 # In a real scenario, this would use the google.generativeai library
 
+# GenerativeModel instances keyed by (sha256(api_key), model_name), so constructing many
+# clients doesn't reconfigure genai or rebuild the model each time. genai.configure() is
+# process-global, so it is only called again when a client with a different key is created.
+_MODEL_CACHE = {}
+_configured_key_hash = None
+_model_cache_lock = threading.Lock()
+
+def _get_model(api_key, model_name):
+    global _configured_key_hash
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    with _model_cache_lock:
+        if _configured_key_hash != key_hash:
+            genai.configure(api_key=api_key)
+            _configured_key_hash = key_hash
+        model = _MODEL_CACHE.get((key_hash, model_name))
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            _MODEL_CACHE[(key_hash, model_name)] = model
+        return model
+
 class GeminiClient:
     def __init__(self, api_key):
         self.api_key = api_key
+        self.model_name = DEFAULT_MODEL
+        self._key_hash = hashlib.sha256(api_key.encode()).hexdigest() if api_key else None # Cache keys; see _response_cache
         self.model = None
         if api_key:
             try:
-                genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('models/gemini-2.0-flash')
-                print(f"GeminiClient initialized and configured with API key for models/gemini-2.0-flash.")
+                self.model = _get_model(api_key, self.model_name)
+                logger.info("GeminiClient initialized and configured with API key for %s.", self.model_name)
             except Exception as e:
-                print(f"GeminiClient ERROR: Failed to configure Gemini with API key: {e}")
+                logger.error("Failed to configure Gemini with API key: %s", e)
                 traceback.print_exc()
                 self.model = None # Ensure model is None if configuration fails
         else:
-            print(f"GeminiClient WARNING: Initialized without API key. Calls will fail.")
+            logger.warning("Initialized without API key. Calls will fail.")
 
-    def get_gemini_response(self, prompt, search_internet=False): # search_internet is not directly used by gemini-pro text-only
+    def get_gemini_response(self, prompt, search_internet=False, cache_ttl=None): # search_internet is not directly used by gemini-pro text-only
         """
         Gets a response from Gemini.
         search_internet parameter is noted but not directly applicable to 'gemini-pro' in this basic text generation.
         If future models or configurations support toggling search, this parameter can be used.
+        Successful responses are cached per prompt, except search_internet ones. cache_ttl
+        overrides _RESPONSE_CACHE_TTL: a cached response is only used if it is at most cache_ttl
+        seconds old, and a new one is kept for that long; 0 bypasses the cache.
+        Concurrent calls with the same prompt share one API request either way.
         """
-        print(f"GeminiClient INFO: Received prompt for Gemini: '{prompt}', Search Internet: {search_internet}")
+        logger.debug("Received prompt for Gemini: '%s', Search Internet: %s", prompt, search_internet)
 
         if not self.api_key:
             error_message = "Error: API Key not configured for GeminiClient."
-            print(f"GeminiClient ERROR: Failed to get response. Reason: {error_message}")
+            logger.error("Failed to get response. Reason: %s", error_message)
             return error_message
 
         if not self.model:
             error_message = "Error: Gemini model not initialized. Check API key and configuration."
-            print(f"GeminiClient ERROR: Failed to get response. Reason: {error_message}")
+            logger.error("Failed to get response. Reason: %s", error_message)
             return error_message
 
-        print("GeminiClient INFO: Attempting to call Gemini API...")
+        cache_key = (self._key_hash, self.model_name, prompt)
+        if search_internet:
+            cache_key += ("search",) # Only shares the in-flight request; never cached
+        cache_ttl = _resolve_cache_ttl(search_internet, cache_ttl)
+        cached = _get_cached_response(cache_key, max_age=cache_ttl) if cache_ttl > 0 else None
+        if cached is not None:
+            logger.debug("Returning cached response for identical prompt.")
+            return cached
+
+        with _in_flight_lock:
+            pending = _in_flight.get(cache_key)
+            if pending is None:
+                pending = _in_flight[cache_key] = Future()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            logger.debug("Identical prompt already being sent; waiting for its response.")
+            return pending.result() # Errors included: a retry right away would most likely fail the same way
+        response_text = None
+        try:
+            response_text = self._generate_response(prompt, search_internet, cache_key, cache_ttl)
+            return response_text
+        finally:
+            with _in_flight_lock:
+                del _in_flight[cache_key]
+            pending.set_result(response_text if response_text is not None else
+                               "Error: An unexpected error occurred while communicating with Gemini API.")
+
+    def _generate_response(self, prompt, search_internet, cache_key, cache_ttl):
+        """The API call behind get_gemini_response. Returns the text or an "Error: ..." string."""
+        logger.debug("Attempting to call Gemini API...")
 
         try:
             # Note: The 'search_internet' flag isn't a direct parameter for generate_content
@@ -55,7 +179,7 @@ class GeminiClient:
             if search_internet:
                 # This is a simple approach. More advanced usage might involve specific tools.
                 # For now, we'll just log that search was requested.
-                print(f"GeminiClient INFO: Internet search requested for prompt. Current model ('gemini-pro') behavior depends on its built-in capabilities.")
+                logger.debug("Internet search requested for prompt. Current model ('gemini-pro') behavior depends on its built-in capabilities.")
 
 
             response = self.model.generate_content(prompt)
@@ -66,7 +190,7 @@ class GeminiClient:
                 if response.prompt_feedback and response.prompt_feedback.block_reason:
                     block_reason = response.prompt_feedback.block_reason.name
                 error_message = f"Error: Gemini API returned no content, possibly due to safety settings or other restrictions. Block Reason: {block_reason}"
-                print(f"GeminiClient WARNING: {error_message}")
+                logger.warning("%s", error_message)
                 # Check if there are candidates at all, even if parts is empty
                 if hasattr(response, 'candidates') and response.candidates:
                     candidate = response.candidates[0]
@@ -78,26 +202,211 @@ class GeminiClient:
 
 
             generated_text = "".join(part.text for part in response.parts)
+            if cache_ttl > 0:
+                _cache_response(cache_key, generated_text, ttl=cache_ttl)
 
-            print(f"GeminiClient SUCCESS: Successfully received response from Gemini.") # Avoid logging full response here if sensitive
+            logger.debug("Successfully received response from Gemini.") # Avoid logging full response here if sensitive
             return generated_text
 
         except genai.types.generation_types.BlockedPromptException as bpe:
             error_message = f"Error: Prompt was blocked by Gemini API. Reason: {bpe}"
-            print(f"GeminiClient ERROR: {error_message}")
+            logger.error("%s", error_message)
             return error_message
         except genai.types.generation_types.StopCandidateException as sce:
             error_message = f"Error: Generation stopped unexpectedly by Gemini API. Reason: {sce}"
-            print(f"GeminiClient ERROR: {error_message}")
+            logger.error("%s", error_message)
             return error_message
         except Exception as e:
             error_message = f"Error: An unexpected error occurred while communicating with Gemini API: {e}"
-            print(f"GeminiClient ERROR: {error_message}")
+            logger.error("%s", error_message)
             traceback.print_exc()
             return error_message
 
+    def stream_gemini_response(self, prompt, search_internet=False, cache_ttl=None):
+        """
+        Generator variant of get_gemini_response that yields text chunks as Gemini produces
+        them, so callers can start formatting or sending before generation finishes.
+        cache_ttl works as in get_gemini_response (0 bypasses the cache).
+        Errors before any text are yielded as a single "Error: ..." string, matching
+        get_gemini_response; if the stream fails after text was yielded, GeminiStreamError is
+        raised instead, so the partial text isn't mistaken for a whole answer.
+        """
+        logger.debug("Received prompt for streaming: '%s', Search Internet: %s", prompt, search_internet)
+
+        if not self.api_key or not self.model:
+            error_message = "Error: Gemini model not initialized. Check API key and configuration."
+            logger.error("Failed to get response. Reason: %s", error_message)
+            yield error_message
+            return
+
+        cache_key = (self._key_hash, self.model_name, prompt)
+        cache_ttl = _resolve_cache_ttl(search_internet, cache_ttl)
+        if cache_ttl > 0:
+            cached = _get_cached_response(cache_key, max_age=cache_ttl)
+            if cached is not None:
+                logger.debug("Returning cached response for identical prompt.")
+                yield cached
+                return
+
+        chunks = []
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                text = "".join(part.text for part in chunk.parts)
+                if text:
+                    chunks.append(text)
+                    yield text
+        except Exception as e:
+            error_message = f"Error: An unexpected error occurred while streaming from Gemini API: {e}"
+            logger.error("%s", error_message)
+            if chunks:
+                raise GeminiStreamError(error_message) from e
+            yield error_message
+            return
+
+        if not chunks:
+            error_message = "Error: Gemini API returned no content, possibly due to safety settings or other restrictions."
+            logger.warning("%s", error_message)
+            yield error_message
+            return
+
+        if cache_ttl > 0:
+            _cache_response(cache_key, "".join(chunks), ttl=cache_ttl)
+        logger.debug("Finished streaming response from Gemini.")
+
+    def get_many(self, prompts, search_internet=False, workers=8, cache_ttl=None):
+        """
+        Gets responses for several prompts in parallel. generate_content is a blocking HTTPS
+        call dominated by model latency, so a thread pool overlaps the waits. Duplicate
+        prompts are sent only once.
+
+        Returns:
+            list: Response (or error message) strings, in the same order as `prompts`.
+        """
+        prompts = list(prompts)
+        unique = list(dict.fromkeys(prompts))
+        if not unique:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(unique)))) as pool:
+            answers = dict(zip(unique, pool.map(lambda prompt: self.get_gemini_response(prompt, search_internet, cache_ttl), unique)))
+        return [answers[prompt] for prompt in prompts]
+
+    # Sync counterpart of AsyncGeminiClient.get_gemini_responses.
+    get_gemini_responses = get_many
+
+class AsyncGeminiClient:
+    """
+    Non-blocking Gemini client that calls the generateContent REST endpoint with httpx
+    (optional dependency). All instances share one pooled httpx.AsyncClient per event loop,
+    so concurrent calls reuse keep-alive connections; a connection never outlives the loop
+    that opened it, so a later asyncio.run() gets a fresh pool.
+    """
+    _http_clients = weakref.WeakKeyDictionary() # {event loop: httpx.AsyncClient}
+    _http_clients_lock = threading.Lock() # Loops on different threads share the dict
+
+    def __init__(self, api_key, model_name=DEFAULT_MODEL, timeout=120):
+        if httpx is None:
+            raise ImportError("AsyncGeminiClient requires the 'httpx' package (pip install httpx).")
+        self.api_key = api_key
+        self.model_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+        self._key_hash = hashlib.sha256(api_key.encode()).hexdigest() if api_key else None # Cache keys; see _response_cache
+        self.timeout = timeout
+        if not api_key:
+            logger.warning("Initialized without API key. Calls will fail.")
+
+    @classmethod
+    def _get_http_client(cls):
+        """Returns the running loop's shared client, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with cls._http_clients_lock:
+            for stale_loop in [other for other in cls._http_clients if other.is_closed()]:
+                del cls._http_clients[stale_loop] # Its connections died with it (and the client keeps the loop alive)
+            client = cls._http_clients.get(loop)
+            if client is None or client.is_closed:
+                limits = httpx.Limits(max_connections=32, max_keepalive_connections=8)
+                client = cls._http_clients[loop] = httpx.AsyncClient(limits=limits)
+        return client
+
+    @classmethod
+    async def aclose(cls):
+        """Closes the running loop's shared HTTP client. A new one is created on the next call."""
+        with cls._http_clients_lock:
+            client = cls._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def get_gemini_response(self, prompt, search_internet=False, cache_ttl=None):
+        """
+        Async counterpart of GeminiClient.get_gemini_response. Returns the generated text,
+        or an "Error: ..." string on failure, and caches by cache_ttl, like the sync client.
+        """
+        logger.debug("Received prompt for Gemini: '%s', Search Internet: %s", prompt, search_internet)
+
+        if not self.api_key:
+            error_message = "Error: API Key not configured for AsyncGeminiClient."
+            logger.error("Failed to get response. Reason: %s", error_message)
+            return error_message
+
+        cache_key = (self._key_hash, self.model_name, prompt)
+        cache_ttl = _resolve_cache_ttl(search_internet, cache_ttl)
+        if cache_ttl > 0:
+            cached = _get_cached_response(cache_key, max_age=cache_ttl)
+            if cached is not None:
+                logger.debug("Returning cached response for identical prompt.")
+                return cached
+
+        url = GENERATE_CONTENT_URL.format(model=self.model_name)
+        body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        try:
+            response = await self._get_http_client().post(
+                url, json=body, headers={"x-goog-api-key": self.api_key}, timeout=self.timeout)
+            if response.status_code != 200:
+                error_message = f"Error: Gemini API returned HTTP {response.status_code}: {response.text[:500]}"
+                logger.error("%s", error_message)
+                return error_message
+            data = response.json()
+        except Exception as e:
+            error_message = f"Error: An unexpected error occurred while communicating with Gemini API: {e}"
+            logger.error("%s", error_message)
+            return error_message
+
+        candidates = data.get("candidates") or []
+        parts = candidates[0].get("content", {}).get("parts", []) if candidates else []
+        if not parts:
+            block_reason = (data.get("promptFeedback") or {}).get("blockReason", "Unknown")
+            error_message = f"Error: Gemini API returned no content, possibly due to safety settings or other restrictions. Block Reason: {block_reason}"
+            if candidates and candidates[0].get("finishReason", "STOP") != "STOP":
+                error_message += f" (Finish Reason: {candidates[0]['finishReason']})"
+            logger.warning("%s", error_message)
+            return error_message
+
+        generated_text = "".join(part.get("text", "") for part in parts)
+        if cache_ttl > 0:
+            _cache_response(cache_key, generated_text, ttl=cache_ttl)
+        logger.debug("Successfully received response from Gemini.")
+        return generated_text
+
+    async def get_gemini_responses(self, prompts, search_internet=False, max_concurrency=8, cache_ttl=None):
+        """
+        Gets responses for several prompts concurrently over the shared connection pool,
+        with at most `max_concurrency` requests in flight. Duplicate prompts are sent once.
+
+        Returns:
+            list: Response (or error message) strings, in the same order as `prompts`.
+        """
+        prompts = list(prompts)
+        unique = list(dict.fromkeys(prompts))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch(prompt):
+            async with semaphore:
+                return await self.get_gemini_response(prompt, search_internet, cache_ttl)
+
+        answers = dict(zip(unique, await asyncio.gather(*(fetch(prompt) for prompt in unique))))
+        return [answers[prompt] for prompt in prompts]
+
 if __name__ == '__main__':
     # Example Usage (for testing this module directly)
+    logging.basicConfig(level=logging.INFO, format="%(name)s %(levelname)s: %(message)s")
     print("Testing GeminiClient...")
     
     # IMPORTANT: To test this, you need to set a GOOGLE_API_KEY environment variable
@@ -1,5 +1,50 @@
 import google.generativeai as genai
+import json
 import os
+import time
+
+# Кэш разрешённых имён моделей (например, '-latest' -> конкретное имя), чтобы при повторных
+# запусках не обращаться к API. Записи устаревают через _MODEL_CACHE_TTL секунд.
+_MODEL_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "emailnews", "gemini_model.json")
+_MODEL_CACHE_TTL = 24 * 60 * 60
+
+def _read_model_cache():
+    try:
+        with open(_MODEL_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _write_model_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(_MODEL_CACHE_PATH), exist_ok=True)
+        with open(_MODEL_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Не удалось сохранить кэш моделей: {e}")
+
+def resolve_model_name(model_name):
+    """
+    Возвращает полное имя модели для model_name (например, 'models/gemini-1.5-pro-latest').
+    Сначала смотрит в кэш на диске; при промахе или истёкшем TTL запрашивает genai.get_model()
+    и сохраняет результат. Если запрос не удался, возвращает исходное имя.
+    """
+    cache = _read_model_cache()
+    entry = cache.get(model_name)
+    if isinstance(entry, dict) and time.time() - entry.get("resolved_at", 0) < _MODEL_CACHE_TTL:
+        return entry.get("name", model_name)
+
+    full_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+    try:
+        resolved = genai.get_model(full_name).name
+    except Exception as e:
+        print(f"Не удалось проверить модель '{model_name}': {e}")
+        return model_name
+
+    cache[model_name] = {"name": resolved, "resolved_at": time.time()}
+    _write_model_cache(cache)
+    return resolved
 
 # --- Шаг 1: Функция для выбора или ввода модели ---
 def choose_model():
@@ -53,8 +98,9 @@ def main():
 
     # --- Шаг 2 и 3: Интеграция и обработка ошибок (будут здесь) ---
     try:
-        print(f"Инициализация модели: {selected_model_name}...")
-        model = genai.GenerativeModel(selected_model_name)
+        resolved_model_name = resolve_model_name(selected_model_name)
+        print(f"Инициализация модели: {resolved_model_name}...")
+        model = genai.GenerativeModel(resolved_model_name)
 
         prompt = input("Введите ваш запрос к модели (например, 'привет'): ")
         if not prompt.strip():
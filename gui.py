@@ -1,34 +1,152 @@
 # gui.py
+import copy
+from datetime import datetime
+import functools
+import math
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox
 import uuid # For generating unique task IDs
 
 # Assuming other modules are in the same directory orPYTHONPATH is set
 import config_manager 
-import scheduler 
+# scheduler is imported where it's used: it pulls in the Gemini SDK, which the window
+# doesn't need in order to appear
 # import gemini_client # Will be used by scheduler, not directly by GUI for now
 from email_sender import EmailSender # Will be used by GUI for test email
 
+# Columns of the task view, with their heading text and initial width.
+TASK_COLUMNS = (
+    ("status", "", 30),
+    ("id", "ID", 80),
+    ("prompt", "Prompt", 230),
+    ("interval", "Interval", 90),
+    ("next", "Next Run", 130),
+    ("net", "Net", 40),
+)
+
+@functools.lru_cache(maxsize=4096)
+def _task_display_parts(enabled, id_prefix, prompt_prefix, interval, search_internet):
+    """
+    Static column values of a task's row: (status, id, prompt, interval, net).
+    Memoized on the task fields, so unchanged tasks don't rebuild their strings on every
+    refresh and an edited task simply maps to a new entry.
+    """
+    status_icon = "✓" if enabled else "✗"
+    return status_icon, id_prefix, f"{prompt_prefix}...", interval, "✓" if search_internet else ""
+
+@functools.lru_cache(maxsize=1024)
+def _format_last_sent(last_sent_iso):
+    """Display form of a task's ISO last_sent_time, memoized so each timestamp is parsed once."""
+    if not last_sent_iso:
+        return "N/A"
+    try:
+        return datetime.fromisoformat(last_sent_iso).strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return str(last_sent_iso)
+
+_TEST_EMAIL_SUBJECT = "Test Email from Gemini Task Scheduler"
+_TEST_EMAIL_HTML = """
+<html><body>
+    <h1>Test Email</h1>
+    <p>This is a test email sent from the Gemini Task Scheduler application.</p>
+    <p>If you received this, your SMTP settings are likely configured correctly!</p>
+</body></html>
+"""
+_TEST_EMAIL_TEXT = "Test Email\n\nThis is a test email sent from the Gemini Task Scheduler application.\nIf you received this, your SMTP settings are likely configured correctly!"
+
+_PORT_RE = re.compile(r"[0-9]{0,5}")
+
+def _validate_port(P):
+    """Key validation for the SMTP port entry: empty, or an integer from 0 to 65535."""
+    return _PORT_RE.fullmatch(P) is not None and (P == "" or int(P) <= 65535)
+
+def _scheduler_running():
+    """scheduler.is_running(), without importing scheduler just to learn it isn't running."""
+    scheduler = sys.modules.get("scheduler")
+    return scheduler is not None and scheduler.is_running()
+
+_STYLE = None
+
+def _style(master):
+    """Returns the shared ttk.Style, creating it on first use."""
+    global _STYLE
+    if _STYLE is None:
+        _STYLE = ttk.Style(master)
+    return _STYLE
+
+class BoundVar(tk.StringVar):
+    """
+    StringVar that writes its value through to target[key] on every change, whether it
+    comes from .set() or from typing into a bound widget, so nothing has to copy it later.
+    """
+    def __init__(self, target, key, master=None, value=None):
+        super().__init__(master, value=target.get(key, "") if value is None else value)
+        self._target = target
+        self._key = key
+        self.trace_add("write", self._write_through)
+
+    def retarget(self, target):
+        """Points the variable at a new dict, e.g. after the config is reloaded."""
+        self._target = target
+
+    def _write_through(self, *args):
+        self._target[self._key] = self.get()
+
 class App:
+    # Edits to the main settings are written this long after the last one, so a burst of
+    # changes costs a single config write.
+    SAVE_DELAY_MS = 500
+    SCHEDULER_POLL_MS = 200
+    STATUS_CLEAR_MS = 3000
+    STATUS_BATCH_MS = 500 # Messages this close together share the status bar instead of replacing each other
+    PERIODIC_IDLE_MS = 5000 # Task view refresh interval while the scheduler is stopped
+    # Countdown refresh interval while the window is in the background, by how far off the next
+    # run is: (under this many seconds, refresh every this many ms); anything later uses the last.
+    PERIODIC_BACKGROUND_MS = ((60, 1000), (600, 10000), (None, 60000))
+    SELECT_DELAY_MS = 40 # Below perceptible latency, but long enough to coalesce key-repeat
+    # Top-level config keys owned by the GUI; tasks are saved through config_manager's task functions.
+    GUI_CONFIG_KEYS = ("gemini_api_key", "recipient_email", "smtp_settings")
+
     def __init__(self, master):
         self.master = master
+        # Keep the window hidden while it's being built, then lay it out once and show it
+        master.withdraw()
+        self._port_vcmd = (master.register(_validate_port), '%P') # Registered once, shared by every SMTP dialog
+        self._email_sender = None # Kept between test emails, see _get_email_sender
+        self._smtp_dialog = None # Built on first open, then reused (see open_smtp_settings_dialog)
+        self._smtp_dialog_vars = {}
+        self._email_sender_sig = None
+        # Derived styles are configured once here; widgets just reference them by name
+        _style(master).configure("Status.TLabel", foreground="gray25")
         master.title("Gemini Task Scheduler")
         master.protocol("WM_DELETE_WINDOW", self.on_closing) # Handle window close
 
-        self.config = config_manager.load_config()
-        self.tasks = self.config.get("scheduled_tasks", []) # Keep a local copy
+        # The config is read on a worker thread so the window can paint right away. Widgets start
+        # from the defaults and are filled in by _poll_config_load once the load finishes.
+        loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ConfigLoad")
+        self._config_future = loader.submit(config_manager.load_config)
+        loader.shutdown(wait=False)
+        self._config_loaded = False
+        self.config = copy.deepcopy(config_manager.DEFAULT_CONFIG)
+        self.tasks = [] # Keep a local copy
+        self._tasks_generation = None # config_manager cache generation self.tasks was last read at
+        self._config_dirty = False
+        self._save_job = None
 
         # --- Configuration Frame ---
         config_frame = ttk.LabelFrame(master, text="Configuration")
         config_frame.grid(row=0, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
 
         ttk.Label(config_frame, text="Gemini API Key:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        self.api_key_var = tk.StringVar(value=self.config.get("gemini_api_key", ""))
+        self.api_key_var = BoundVar(self.config, "gemini_api_key")
         self.api_key_entry = ttk.Entry(config_frame, width=50, textvariable=self.api_key_var)
         self.api_key_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
 
         ttk.Label(config_frame, text="Default Recipient Email:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
-        self.email_var = tk.StringVar(value=self.config.get("recipient_email", ""))
+        self.email_var = BoundVar(self.config, "recipient_email")
         self.email_entry = ttk.Entry(config_frame, width=50, textvariable=self.email_var)
         self.email_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
         
@@ -93,13 +211,30 @@ class App:
         tasks_display_frame = ttk.LabelFrame(master, text="Scheduled Tasks")
         tasks_display_frame.grid(row=3, column=0, columnspan=2, padx=10, pady=5, sticky="nsew")
 
-        self.tasks_listbox = tk.Listbox(tasks_display_frame, height=10, width=70)
-        self.tasks_listbox.pack(side=tk.LEFT, padx=(5,0), pady=5, fill=tk.BOTH, expand=True)
+        # Treeview only draws the rows in view, and each row is keyed by its task ID (iid), so
+        # selections map straight to tasks and refreshes update changed cells in place.
+        self.tasks_tree = ttk.Treeview(tasks_display_frame, columns=[name for name, _, _ in TASK_COLUMNS],
+                                       show="headings", height=10, selectmode="browse")
+        for name, heading, width in TASK_COLUMNS:
+            self.tasks_tree.heading(name, text=heading)
+            self.tasks_tree.column(name, width=width, stretch=(name == "prompt"),
+                                   anchor="center" if name in ("status", "net") else "w")
+        self.tasks_tree.pack(side=tk.LEFT, padx=(5,0), pady=5, fill=tk.BOTH, expand=True)
         
-        # Scrollbar for listbox
-        scrollbar = ttk.Scrollbar(tasks_display_frame, orient=tk.VERTICAL, command=self.tasks_listbox.yview)
+        # Scrollbar for the task view
+        scrollbar = ttk.Scrollbar(tasks_display_frame, orient=tk.VERTICAL, command=self.tasks_tree.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=5, padx=(0,5))
-        self.tasks_listbox.config(yscrollcommand=scrollbar.set)
+        self._tasks_scrollbar = scrollbar
+        self.tasks_tree.config(yscrollcommand=self._on_tasks_tree_scrolled)
+        self._scheduler_statuses = {}
+        self._scheduler_running = False
+        self._row_values = {} # iid -> values currently shown, to skip unchanged rows
+        self._iid_to_index = {} # iid -> index into self.tasks, rebuilt on every refresh
+        self._row_order = [] # iids in display order
+        self._stale_rows = {} # iid -> values not yet shown because the row is scrolled out of view
+        self._enabled_tasks = [] # Enabled subset of self.tasks, rebuilt with the rows
+        self._last_details_sig = None # What the details pane currently shows, see on_task_select
+        self._details_enabled = None # Enabled state the enable/disable buttons reflect
 
         # TODO: Add Edit Task button (consider how it interacts with running tasks)
         # TODO: Add Enable/Disable Task button
@@ -113,11 +248,7 @@ class App:
 
         ttk.Label(self.task_details_frame, text="Last Response:").pack(anchor="w", padx=5, pady=(5,0))
         self.details_last_response_text = tk.Text(self.task_details_frame, height=8, width=40, wrap=tk.WORD, state=tk.DISABLED)
-        self.details_last_response_text.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
-
-        # Make the text widget expand
-        self.task_details_frame.grid_rowconfigure(1, weight=1) # Assuming Last Response Text is effectively row 1 after labels
-        self.task_details_frame.grid_columnconfigure(0, weight=1)
+        self.details_last_response_text.pack(padx=5, pady=5, fill=tk.BOTH, expand=True) # expand lets it grow with the pane
 
 
         # --- Frame for task actions (Enable/Disable) ---
@@ -144,19 +275,39 @@ class App:
         
         self.remove_task_button = ttk.Button(control_frame, text="Remove Selected Task", command=self.remove_selected_task)
         self.remove_task_button.pack(side=tk.LEFT, padx=15) 
+
+        # --- Status Bar (non-blocking confirmations) ---
+        self.status_var = tk.StringVar()
+        ttk.Label(master, textvariable=self.status_var, anchor="w", style="Status.TLabel").grid(row=6, column=0, columnspan=3, padx=10, pady=(0,5), sticky="ew")
+        self._status_clear_job = None
+        self._status_batch_job = None
+        self._status_messages = [] # Messages shown in the current batch window
         
-        master.grid_columnconfigure(1, weight=1) # Allow task list to expand (col 0 is label)
-        master.grid_columnconfigure(2, weight=1) # Allow task details to expand
-        master.grid_rowconfigure(3, weight=1) # Allow task display frame (row containing listbox and details) to expand vertically
-        tasks_display_frame.grid_columnconfigure(0, weight=1) # Allow listbox to expand horizontally
-        self.task_details_frame.grid_rowconfigure(2, weight=1) # Ensure Text widget can expand
-        self.task_details_frame.grid_columnconfigure(0, weight=1)
+        master.grid_columnconfigure((1, 2), weight=1) # Allow task list (col 0 is label) and task details to expand
+        master.grid_rowconfigure(3, weight=1) # Allow task display frame (row containing task view and details) to expand vertically
+        # tasks_display_frame and task_details_frame lay out their children with pack
+        # (fill/expand), so they need no grid weights of their own.
 
 
-        self.tasks_listbox.bind('<<ListboxSelect>>', self.on_task_select)
-        self.update_tasks_listbox() # Load tasks from config into listbox
+        self._select_job = None
+        self.tasks_tree.bind('<<TreeviewSelect>>', self._on_tree_select)
         self.clear_task_details() # Initialize details pane
-        self.master.after(1000, self.periodic_update_tasks_display) # Start periodic updates for countdowns and details
+        # Actions that read or write the config wait for it to load
+        for button in (self.add_task_button, self.start_button, self.smtp_button):
+            button.config(state=tk.DISABLED)
+        self.master.after(0, self._poll_config_load)
+        self._scheduler_was_running = False
+        self.master.after(self.SCHEDULER_POLL_MS, self._poll_scheduler_status)
+        # Start periodic updates for countdowns and details; paused while the window is minimized
+        self._window_mapped = True
+        self._periodic_slow = False # Last delay was a background one; regaining focus rearms it
+        self._periodic_job = self.master.after(1000, self.periodic_update_tasks_display)
+        self.master.bind("<Map>", self._on_window_map, add="+")
+        self.master.bind("<Unmap>", self._on_window_unmap, add="+")
+        self.master.bind("<FocusIn>", self._on_window_focus_in, add="+")
+
+        master.update_idletasks() # One geometry pass for the finished widget tree
+        master.deiconify()
 
     # def stop_scheduler_gui(self, silent=False): # Added silent parameter - This is now defined earlier due to merge sequence
     #     print(f"DEBUG: gui.py -> stop_scheduler_gui(silent={silent}) CALLED")
@@ -168,6 +319,82 @@ class App:
     #     self.add_task_button.config(state=tk.NORMAL)
     #     self.remove_task_button.config(state=tk.NORMAL)
 
+    def _poll_config_load(self):
+        """Installs the background-loaded config into the widgets once it is ready."""
+        if not self._config_future.done():
+            self.master.after(20, self._poll_config_load)
+            return
+        try:
+            self.config = self._config_future.result()
+        except Exception as e: # load_config handles its own errors; this is a last resort
+            print(f"GUI ERROR: Failed to load configuration: {e}")
+        self.api_key_var.retarget(self.config)
+        self.api_key_var.set(self.config.get("gemini_api_key", ""))
+        self.email_var.retarget(self.config)
+        self.email_var.set(self.config.get("recipient_email", ""))
+        self.test_email_recipient_var.set(self.config.get("recipient_email", ""))
+        self.tasks = self.config.get("scheduled_tasks", [])
+        self._config_loaded = True
+        # Auto-save edits from here on; the traces are added after the .set() calls above so
+        # installing the loaded values doesn't write them straight back
+        self.api_key_var.trace_add("write", self._on_main_field_edited)
+        self.email_var.trace_add("write", self._on_main_field_edited)
+        self.update_tasks_listbox() # Load tasks from config into the task view
+        for button in (self.add_task_button, self.start_button, self.smtp_button):
+            button.config(state=tk.NORMAL)
+
+    def _poll_scheduler_status(self):
+        """
+        Keeps the scheduler buttons in step with the scheduler thread (e.g. if it stops on its
+        own) and picks up the scheduler's events.
+        """
+        self._handle_scheduler_events()
+        running = _scheduler_running()
+        if self._config_loaded and running != self._scheduler_was_running:
+            idle_state = tk.DISABLED if running else tk.NORMAL
+            self.start_button.config(state=idle_state)
+            self.stop_button.config(state=tk.NORMAL if running else tk.DISABLED)
+            self.add_task_button.config(state=idle_state)
+            self.remove_task_button.config(state=idle_state)
+        if self._config_loaded:
+            self._scheduler_was_running = running
+        self.master.after(self.SCHEDULER_POLL_MS, self._poll_scheduler_status)
+
+    def _handle_scheduler_events(self):
+        """Re-reads the tasks from disk only when the scheduler says a task has run."""
+        scheduler = sys.modules.get("scheduler") # No scheduler loaded, no events
+        if scheduler is None or not self._config_loaded:
+            return
+        if any(event == "task_ran" for event, _ in scheduler.poll_events()):
+            self.update_tasks_listbox(refresh_from_disk=True)
+            # The selected task may be the one that ran; on_task_select skips unchanged details
+            if self.tasks_tree.selection():
+                self.on_task_select()
+
+    def show_status(self, message):
+        """
+        Shows a message in the status bar, clearing it after STATUS_CLEAR_MS. Messages arriving
+        within STATUS_BATCH_MS of the first of a burst (e.g. several removals) are summarized
+        as the latest one plus a count, so none of them silently vanishes.
+        """
+        if self._status_batch_job is None:
+            self._status_messages = []
+            self._status_batch_job = self.master.after(self.STATUS_BATCH_MS, self._end_status_batch)
+        self._status_messages.append(message)
+        if len(self._status_messages) > 1:
+            message = f"{message} (+{len(self._status_messages) - 1} more)"
+        self.status_var.set(message)
+        if self._status_clear_job is not None:
+            self.master.after_cancel(self._status_clear_job) # A newer message restarts the timer
+        self._status_clear_job = self.master.after(self.STATUS_CLEAR_MS, self._clear_status)
+
+    def _end_status_batch(self):
+        self._status_batch_job = None
+
+    def _clear_status(self):
+        self._status_clear_job = None
+        self.status_var.set("")
+
     def send_test_email(self):
         """Sends a test email using the configured SMTP settings."""
         # Ensure current config (especially SMTP settings) is up-to-date
@@ -185,78 +412,124 @@ class App:
             messagebox.showerror("Error", "SMTP settings are incomplete. Please configure them via 'SMTP Settings'.", parent=self.master)
             return
         
-        # Password can be empty for some SMTP setups, so we don't strictly check its presence here,
-        # but EmailSender will require it if the server does.
+        # The password isn't checked here; EmailSender raises ValueError if it is missing.
 
         print(f"GUI INFO: Attempting to send test email to {test_recipient} using SMTP: {smtp_settings['user']}@{smtp_settings['server']}")
 
         try:
-            sender = EmailSender(
-                smtp_server=smtp_settings["server"],
-                smtp_port=int(smtp_settings["port"]), # Ensure port is int
-                smtp_user=smtp_settings["user"],
-                smtp_password=smtp_settings.get("password", ""), # Get password, could be empty
-                use_tls=smtp_settings.get("use_tls", True),
-                use_ssl=smtp_settings.get("use_ssl", False) # Pass the new SSL setting
-            )
-            
-            subject = "Test Email from Gemini Task Scheduler"
-            body_html = """
-            <html><body>
-                <h1>Test Email</h1>
-                <p>This is a test email sent from the Gemini Task Scheduler application.</p>
-                <p>If you received this, your SMTP settings are likely configured correctly!</p>
-            </body></html>
-            """
-            body_text = "Test Email\n\nThis is a test email sent from the Gemini Task Scheduler application.\nIf you received this, your SMTP settings are likely configured correctly!"
-
-            if sender.send_email(test_recipient, subject, body_html, body_text):
-                messagebox.showinfo("Success", f"Test email sent successfully to {test_recipient}.", parent=self.master)
-            else:
-                # EmailSender already prints detailed errors to console.
-                messagebox.showerror("Failure", f"Failed to send test email to {test_recipient}.\nCheck console logs from EmailSender for details.", parent=self.master)
-        except ValueError as ve: # For int(smtp_settings["port"])
-            messagebox.showerror("Error", f"Invalid SMTP port configured: {smtp_settings.get('port')}. Must be a number.", parent=self.master)
-            print(f"GUI ERROR: Invalid SMTP port format for test email: {ve}")
+            sender = self._get_email_sender(smtp_settings)
+        except ValueError as ve: # int(smtp_settings["port"]) or incomplete settings rejected by EmailSender
+            messagebox.showerror("Error", f"Invalid SMTP settings (port: {smtp_settings.get('port')}): {ve}", parent=self.master)
+            print(f"GUI ERROR: Invalid SMTP settings for test email: {ve}")
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"An unexpected error occurred while trying to send test email: {e}", parent=self.master)
+            print(f"GUI ERROR: Unexpected error during send_test_email: {e}")
+            return
+
+        # Connecting and sending can take seconds; do it on a worker thread so the window stays
+        # responsive, and pick up the result from the Tk thread once it's done.
+        self.send_test_email_button.config(state=tk.DISABLED, text="Sending...")
+        worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TestEmail")
+        future = worker.submit(sender.send_email, test_recipient, _TEST_EMAIL_SUBJECT, _TEST_EMAIL_HTML, _TEST_EMAIL_TEXT)
+        worker.shutdown(wait=False)
+        self.master.after(50, self._poll_test_email, future, test_recipient)
+
+    def _get_email_sender(self, smtp_settings):
+        """
+        Returns an EmailSender for these settings, reusing the previous one (and its open,
+        authenticated SMTP session) while the settings are unchanged, so repeat test sends
+        skip the connect/TLS/login round trips. EmailSender checks the session with NOOP and
+        reconnects by itself if it has dropped or sat idle.
+        """
+        sig = (smtp_settings["server"], int(smtp_settings["port"]), smtp_settings["user"], # Ensure port is int
+               smtp_settings.get("password", ""), smtp_settings.get("use_tls", True), smtp_settings.get("use_ssl", False))
+        if self._email_sender is not None and sig == self._email_sender_sig:
+            return self._email_sender
+        self._close_email_sender()
+        server, port, user, password, use_tls, use_ssl = sig
+        self._email_sender = EmailSender(
+            smtp_server=server,
+            smtp_port=port,
+            smtp_user=user,
+            smtp_password=password, # Get password, could be empty
+            use_tls=use_tls,
+            use_ssl=use_ssl, # Pass the new SSL setting
+            persistent=True
+        )
+        self._email_sender_sig = sig
+        return self._email_sender
+
+    def _close_email_sender(self):
+        if self._email_sender is not None:
+            self._email_sender.close()
+            self._email_sender = None
+            self._email_sender_sig = None
+
+    def _poll_test_email(self, future, test_recipient):
+        """Reports the outcome of send_test_email's background send once it finishes."""
+        if not future.done():
+            self.master.after(50, self._poll_test_email, future, test_recipient)
+            return
+        self.send_test_email_button.config(state=tk.NORMAL, text="Send Test Email")
+        try:
+            sent = future.result()
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred while trying to send test email: {e}", parent=self.master)
             print(f"GUI ERROR: Unexpected error during send_test_email: {e}")
+            return
+        if sent:
+            self.show_status(f"Test email sent to {test_recipient}.")
+        else:
+            # EmailSender already prints detailed errors to console.
+            messagebox.showerror("Failure", f"Failed to send test email to {test_recipient}.\nCheck console logs from EmailSender for details.", parent=self.master)
+
 
+    def _on_tree_select(self, event):
+        """
+        <<TreeviewSelect>> handler. Holding an arrow key fires this ~30 times a second, so the
+        details refresh is deferred by SELECT_DELAY_MS and a burst of selections costs one.
+        """
+        if self._select_job is not None:
+            self.master.after_cancel(self._select_job)
+        self._select_job = self.master.after(self.SELECT_DELAY_MS, self._on_tree_select_settled)
+
+    def _on_tree_select_settled(self):
+        self._select_job = None
+        self.on_task_select()
 
     def on_task_select(self, event=None): # event is ignored but passed by Tkinter bind
         """
-        Handles selection changes in the tasks listbox.
+        Handles selection changes in the task view.
         Updates the task details pane and enable/disable buttons.
         """
-        selected_indices = self.tasks_listbox.curselection()
-        if not selected_indices: # If nothing is selected
+        selected_index = self._selected_task_index()
+        if selected_index is None: # If nothing is selected
             self.clear_task_details()
             self.enable_task_button.config(state=tk.DISABLED)
             self.disable_task_button.config(state=tk.DISABLED)
             return
 
-        selected_index = selected_indices[0]
         if 0 <= selected_index < len(self.tasks):
             selected_task_data = self.tasks[selected_index] # self.tasks is from config
-
-            # Update details pane
-            last_sent_str = "N/A"
-            if selected_task_data.get("last_sent_time"):
-                try:
-                    from datetime import datetime 
-                    dt_obj = datetime.fromisoformat(selected_task_data["last_sent_time"])
-                    last_sent_str = dt_obj.strftime("%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    last_sent_str = selected_task_data["last_sent_time"] 
-
-            self.details_last_sent_var.set(f"Last Sent: {last_sent_str}")
-            self.details_last_response_text.config(state=tk.NORMAL)
-            self.details_last_response_text.delete("1.0", tk.END)
-            self.details_last_response_text.insert(tk.END, selected_task_data.get("last_response", "No response recorded."))
-            self.details_last_response_text.config(state=tk.DISABLED)
+            # The periodic refresh calls this every tick; leave the widgets alone unless what
+            # they show has changed. Rewriting the Text is the expensive part for long responses.
+            details_sig = (selected_task_data.get("id"), selected_task_data.get("last_sent_time"),
+                           selected_task_data.get("last_response"))
+            if details_sig != self._last_details_sig:
+                self._last_details_sig = details_sig
+                last_sent_str = _format_last_sent(selected_task_data.get("last_sent_time"))
+                self.details_last_sent_var.set(f"Last Sent: {last_sent_str}")
+                self.details_last_response_text.config(state=tk.NORMAL)
+                self.details_last_response_text.delete("1.0", tk.END)
+                self.details_last_response_text.insert(tk.END, selected_task_data.get("last_response", "No response recorded."))
+                self.details_last_response_text.config(state=tk.DISABLED)
 
             # Update Enable/Disable buttons based on task's current 'enabled' state
             is_enabled = selected_task_data.get("enabled", True) # Default to True if not present
+            if is_enabled == self._details_enabled:
+                return
+            self._details_enabled = is_enabled
             if is_enabled:
                 self.enable_task_button.config(state=tk.DISABLED)
                 self.disable_task_button.config(state=tk.NORMAL)
@@ -270,6 +543,8 @@ class App:
 
     def clear_task_details(self):
         """Clears the task details pane, resetting it to a default state."""
+        self._last_details_sig = None
+        self._details_enabled = None # Callers reset the enable/disable buttons themselves
         self.details_last_sent_var.set("Last Sent: N/A")
         self.details_last_response_text.config(state=tk.NORMAL)
         self.details_last_response_text.delete("1.0", tk.END)
@@ -278,12 +553,11 @@ class App:
 
     def _handle_task_enable_disable(self, enable_flag):
         """Common logic for enabling or disabling a selected task."""
-        selected_indices = self.tasks_listbox.curselection()
-        if not selected_indices:
+        selected_index = self._selected_task_index()
+        if selected_index is None:
             messagebox.showwarning("No Selection", "Please select a task.")
             return
 
-        selected_index = selected_indices[0]
         if 0 <= selected_index < len(self.tasks):
             task_to_modify = self.tasks[selected_index]
             task_id = task_to_modify.get("id")
@@ -297,23 +571,25 @@ class App:
             updated_task_data["enabled"] = enable_flag
 
             if config_manager.update_task_in_config(task_id, updated_task_data):
-                # Refresh local tasks cache directly for consistency before UI update
-                self.tasks = config_manager.get_tasks() 
-                
-                # Update listbox and selection state for buttons
-                self.update_tasks_listbox() 
-                # Try to reselect the item to update button states, may need index adjustment if list changes
-                self.tasks_listbox.select_set(selected_index) 
+                # Only this task changed: update it in place and redraw just its row, rather than
+                # re-reading the config and re-formatting every row
+                task_to_modify["enabled"] = enable_flag
+                self._refresh_task_row(self.tasks_tree.selection()[0])
                 self.on_task_select() # Refresh button states based on new task state
 
                 action = "enabled" if enable_flag else "disabled"
-                messagebox.showinfo("Success", f"Task '{task_to_modify['prompt'][:30]}...' {action}.")
-
-                # If scheduler is running, restart it to apply changes
-                if scheduler._scheduler_thread and scheduler._scheduler_thread.is_alive():
-                    print(f"GUI: Scheduler running, restarting to apply task enable/disable changes for task {task_id}")
-                    self.stop_scheduler_gui(silent=True) # Pass silent
-                    self.start_scheduler_gui(silent=True) # Pass silent
+                self.show_status(f"Task '{task_to_modify['prompt'][:30]}...' {action}.")
+
+                # If scheduler is running, have its thread (un)schedule just this task instead of
+                # restarting it, which re-adds every task and blocks on the thread join
+                if _scheduler_running():
+                    import scheduler
+                    print(f"GUI: Scheduler running, updating the schedule for {action} task {task_id}")
+                    if enable_flag:
+                        scheduler.post_command("add", dict(task_to_modify), self.api_key_var.get(), self.email_var.get(),
+                                               self.config.get("smtp_settings", {}))
+                    else:
+                        scheduler.post_command("remove", task_id)
             else:
                 messagebox.showerror("Error", f"Failed to update task '{task_to_modify['prompt'][:30]}...' state.")
         else:
@@ -329,65 +605,130 @@ class App:
 
     def periodic_update_tasks_display(self):
         """
-        Periodically updates the task listbox (for countdowns) and the details pane
-        (if a task is selected and its info might have changed).
-        This function reschedules itself to run every second.
+        Periodically updates the countdowns in the task view.
+        This function reschedules itself: every second (sooner if a task is about to run) while
+        the scheduler is running, every PERIODIC_IDLE_MS while it isn't, and not at all while
+        the window is minimized. While another window has the focus and the next run is far
+        off, the countdowns refresh less often (PERIODIC_BACKGROUND_MS).
         """
-        if scheduler._scheduler_thread and scheduler._scheduler_thread.is_alive():
-            self.update_tasks_listbox() # Refreshes countdowns in the list
-            # If a task is selected, its details (like last sent time/response) might change
-            # due to scheduler actions, so refresh the details pane too.
-            if self.tasks_listbox.curselection():
-                self.on_task_select()
-        self.master.after(1000, self.periodic_update_tasks_display) # Reschedule for the next second
+        self._periodic_job = None
+        if not self._window_mapped:
+            return # _on_window_map restarts the updates
+        delay_ms = self.PERIODIC_IDLE_MS
+        self._periodic_slow = False
+        if _scheduler_running():
+            import scheduler
+            # Refreshes countdowns only. New last-run details arrive as scheduler events, which
+            # _handle_scheduler_events turns into a re-read of the config and the details pane.
+            self.update_tasks_listbox()
+            delay_ms = 1000 # Countdowns tick in seconds
+            next_due = scheduler.seconds_until_next_run()
+            if next_due is not None:
+                if not str(self.master.tk.call("focus")): # Empty when none of our windows has the focus
+                    delay_ms = next(ms for limit, ms in self.PERIODIC_BACKGROUND_MS if limit is None or next_due < limit)
+                    self._periodic_slow = delay_ms > 1000
+                # Come back just after the next task fires, so its results show up promptly
+                delay_ms = max(200, min(delay_ms, int(next_due * 1000)))
+        self._periodic_job = self.master.after(delay_ms, self.periodic_update_tasks_display)
+
+    def _rearm_periodic_update(self):
+        """Runs periodic_update_tasks_display now instead of at its next (possibly idle) slot."""
+        if self._periodic_job is not None:
+            self.master.after_cancel(self._periodic_job)
+        self._periodic_job = self.master.after(0, self.periodic_update_tasks_display)
+
+    def _on_window_map(self, event):
+        if event.widget is self.master and not self._window_mapped: # Ignore child widgets' events
+            self._window_mapped = True
+            self._rearm_periodic_update()
+
+    def _on_window_focus_in(self, event):
+        if self._periodic_slow and self._window_mapped: # Catch countdowns up as soon as the user looks
+            self._periodic_slow = False
+            self._rearm_periodic_update()
+
+    def _on_window_unmap(self, event):
+        if event.widget is self.master:
+            self._window_mapped = False
 
     def stop_scheduler_gui(self, silent=False):
         print(f"DEBUG: gui.py -> stop_scheduler_gui(silent={silent}) CALLED") # DEBUG LOG
+        import scheduler
         scheduler.stop_scheduler_thread()
         if not silent:
-            messagebox.showinfo("Scheduler", "Scheduler stopped.")
+            self.show_status("Scheduler stopped.")
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         self.add_task_button.config(state=tk.NORMAL)
         self.remove_task_button.config(state=tk.NORMAL)
 
     def open_smtp_settings_dialog(self):
-        smtp_config = self.config.get("smtp_settings", config_manager.DEFAULT_CONFIG["smtp_settings"].copy())
+        """
+        Shows the SMTP settings dialog, filled from the current config. The dialog is built on
+        first use and hidden rather than destroyed on close, so later opens just refresh it.
+        """
+        smtp_config = self.config.setdefault("smtp_settings", config_manager.DEFAULT_CONFIG["smtp_settings"].copy())
+        if self._smtp_dialog is None or not self._smtp_dialog.winfo_exists():
+            self._build_smtp_dialog()
+        dialog = self._smtp_dialog
+        smtp_vars = self._smtp_dialog_vars
+
+        smtp_vars["server"].set(smtp_config.get("server", ""))
+        smtp_vars["port"].set(str(smtp_config.get("port", "")))
+        smtp_vars["user"].set(smtp_config.get("user", ""))
+        smtp_vars["password"].set(smtp_config.get("password", ""))
+        smtp_vars["use_tls"].set(smtp_config.get("use_tls", True))
+        smtp_vars["use_ssl"].set(smtp_config.get("use_ssl", False))
 
+        # Center the dialog
+        dialog.deiconify()
+        dialog.update_idletasks()
+        x = self.master.winfo_x() + (self.master.winfo_width() // 2) - (dialog.winfo_width() // 2)
+        y = self.master.winfo_y() + (self.master.winfo_height() // 2) - (dialog.winfo_height() // 2)
+        dialog.geometry(f"+{x}+{y}")
+        dialog.grab_set() # Modal behavior
+
+    def _hide_smtp_dialog(self):
+        self._smtp_dialog.grab_release()
+        self._smtp_dialog.withdraw()
+
+    def _build_smtp_dialog(self):
+        """Creates the (initially hidden) SMTP settings dialog; open_smtp_settings_dialog fills it in."""
         dialog = tk.Toplevel(self.master)
+        dialog.withdraw() # Shown by open_smtp_settings_dialog once the fields are filled in
         dialog.title("SMTP Settings")
         dialog.transient(self.master) # Keep dialog on top of main window
-        dialog.grab_set() # Modal behavior
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_smtp_dialog)
 
         frame = ttk.Frame(dialog, padding="10")
         frame.pack(expand=True, fill=tk.BOTH)
 
         ttk.Label(frame, text="SMTP Server:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        server_var = tk.StringVar(value=smtp_config.get("server", ""))
+        server_var = tk.StringVar()
         server_entry = ttk.Entry(frame, width=40, textvariable=server_var)
         server_entry.grid(row=0, column=1, padx=5, pady=5)
 
         ttk.Label(frame, text="SMTP Port:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
-        port_var = tk.StringVar(value=str(smtp_config.get("port", "")))
+        port_var = tk.StringVar()
         port_entry = ttk.Entry(frame, width=10, textvariable=port_var)
         port_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
 
         ttk.Label(frame, text="SMTP User:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
-        user_var = tk.StringVar(value=smtp_config.get("user", ""))
+        user_var = tk.StringVar()
         user_entry = ttk.Entry(frame, width=40, textvariable=user_var)
         user_entry.grid(row=2, column=1, padx=5, pady=5)
 
         ttk.Label(frame, text="SMTP Password:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
-        password_var = tk.StringVar(value=smtp_config.get("password", ""))
+        password_var = tk.StringVar()
         # TODO: Implement secure password storage instead of plaintext in config, as noted in config_manager.py.
         password_entry = ttk.Entry(frame, width=40, textvariable=password_var, show="*")
         password_entry.grid(row=3, column=1, padx=5, pady=5)
 
-        use_tls_var = tk.BooleanVar(value=smtp_config.get("use_tls", True))
+        use_tls_var = tk.BooleanVar()
         tls_check = ttk.Checkbutton(frame, text="Use STARTTLS (e.g., for port 587)", variable=use_tls_var)
         tls_check.grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky="w")
 
-        use_ssl_var = tk.BooleanVar(value=smtp_config.get("use_ssl", False))
+        use_ssl_var = tk.BooleanVar()
         ssl_check = ttk.Checkbutton(frame, text="Use SSL directly (e.g., for port 465)", variable=use_ssl_var)
         ssl_check.grid(row=5, column=0, columnspan=2, padx=5, pady=5, sticky="w")
 
@@ -395,15 +736,7 @@ class App:
         # For now, EmailSender prioritizes SSL if both are true, which is a reasonable fallback.
         # A more interactive UI might disable one when the other is checked.
 
-        def validate_port(P):
-            if P == "":
-                return True
-            if P.isdigit() and 0 <= int(P) <= 65535:
-                return True
-            return False
-
-        vcmd = (dialog.register(validate_port), '%P')
-        port_entry.config(validate='key', validatecommand=vcmd)
+        port_entry.config(validate='key', validatecommand=self._port_vcmd)
 
 
         def on_save():
@@ -418,12 +751,14 @@ class App:
                     messagebox.showerror("Error", "Invalid port number. Must be between 0 and 65535.", parent=dialog)
                     return
 
-                self.config["smtp_settings"]["server"] = server_var.get()
-                self.config["smtp_settings"]["port"] = port_num
-                self.config["smtp_settings"]["user"] = user_var.get()
-                self.config["smtp_settings"]["password"] = password_var.get() # WARNING: Stored in plain text
-                self.config["smtp_settings"]["use_tls"] = use_tls_var.get()
-                self.config["smtp_settings"]["use_ssl"] = use_ssl_var.get()
+                # Bound once per save; the dialog outlives any one config object
+                smtp_config = self.config.setdefault("smtp_settings", {})
+                smtp_config["server"] = server_var.get()
+                smtp_config["port"] = port_num
+                smtp_config["user"] = user_var.get()
+                smtp_config["password"] = password_var.get() # WARNING: Stored in plain text
+                smtp_config["use_tls"] = use_tls_var.get()
+                smtp_config["use_ssl"] = use_ssl_var.get()
 
                 if use_ssl_var.get() and use_tls_var.get():
                     messagebox.showwarning("SMTP Setting Conflict", 
@@ -433,9 +768,10 @@ class App:
                                            parent=dialog)
                     # No need to return, just inform the user. EmailSender will handle it.
 
-                if config_manager.save_config(self.config):
-                    messagebox.showinfo("Success", "SMTP settings saved.", parent=dialog)
-                    dialog.destroy()
+                self._schedule_save()
+                if self._flush_config(): # Write now so the dialog can report the result
+                    self._hide_smtp_dialog()
+                    self.show_status("SMTP settings saved.")
                 else:
                     messagebox.showerror("Error", "Failed to save SMTP settings.", parent=dialog)
             except ValueError:
@@ -443,44 +779,79 @@ class App:
             except Exception as e:
                 messagebox.showerror("Error", f"An unexpected error occurred: {e}", parent=dialog)
 
-        def on_cancel():
-            dialog.destroy()
-
         button_frame = ttk.Frame(frame)
-        button_frame.grid(row=5, column=0, columnspan=2, pady=10)
+        button_frame.grid(row=6, column=0, columnspan=2, pady=10)
 
         save_button = ttk.Button(button_frame, text="Save", command=on_save)
         save_button.pack(side=tk.LEFT, padx=5)
-        cancel_button = ttk.Button(button_frame, text="Cancel", command=on_cancel)
+        cancel_button = ttk.Button(button_frame, text="Cancel", command=self._hide_smtp_dialog)
         cancel_button.pack(side=tk.LEFT, padx=5)
-
-        # Center the dialog
-        dialog.update_idletasks()
-        x = self.master.winfo_x() + (self.master.winfo_width() // 2) - (dialog.winfo_width() // 2)
-        y = self.master.winfo_y() + (self.master.winfo_height() // 2) - (dialog.winfo_height() // 2)
-        dialog.geometry(f"+{x}+{y}")
         dialog.resizable(False, False)
 
+        self._smtp_dialog = dialog
+        self._smtp_dialog_vars = {"server": server_var, "port": port_var, "user": user_var,
+                                  "password": password_var, "use_tls": use_tls_var, "use_ssl": use_ssl_var}
+
 
     def save_main_config(self):
-        """Saves the main configuration details (API key, email)"""
-        self.config["gemini_api_key"] = self.api_key_var.get()
-        self.config["recipient_email"] = self.email_var.get()
+        """Saves the main configuration details (API key, email) once pending edits settle."""
+        if not self._config_dirty:
+            return # Nothing edited since the last write (the field traces set the flag)
+        # The fields are BoundVars, so self.config already holds their values.
         # SMTP settings would be saved in their own dialog/logic
-        if config_manager.save_config(self.config):
-            print("Main configuration saved.")
-        else:
+        self._schedule_save()
+
+    def _on_main_field_edited(self, *args):
+        """Trace callback for the API key/email fields: marks the config dirty; typing bursts coalesce into one save."""
+        if self._config_loaded: # Before that the fields hold placeholders; saving them would wipe the real values
+            self._schedule_save()
+
+    def _schedule_save(self):
+        """Marks the GUI-owned settings dirty and (re)arms a single deferred write."""
+        self._config_dirty = True
+        if self._save_job is not None:
+            self.master.after_cancel(self._save_job)
+        # The deferred write goes to config_manager's writer thread so disk I/O never stalls the UI
+        self._save_job = self.master.after(self.SAVE_DELAY_MS, functools.partial(self._flush_config, background=True))
+
+    def _flush_config(self, background=False):
+        """
+        Writes pending changes to the GUI-owned settings, if any.
+        Only those keys are merged into the current config, so tasks saved in the meantime
+        (by the task functions or the scheduler) aren't overwritten by this window's copy.
+        With background=True the write is queued on config_manager's writer thread, which
+        coalesces queued saves. Returns True on success or when there was nothing to write.
+        """
+        if self._save_job is not None:
+            self.master.after_cancel(self._save_job)
+            self._save_job = None
+        if not self._config_dirty:
+            return True
+        self._config_dirty = False
+
+        with config_manager.edit_config(background=background) as edit:
+            for key in self.GUI_CONFIG_KEYS:
+                if key in self.config and edit.config.get(key) != self.config[key]:
+                    edit.config[key] = self.config[key]
+                    edit.changed = True
+        if edit.changed and not edit.saved:
             messagebox.showerror("Error", "Failed to save main configuration.")
+            return False
+        if edit.changed:
+            print("Main configuration saved.")
+        return True
 
 
     def add_task_gui(self):
-        prompt = self.prompt_text.get("1.0", tk.END).strip()
+        import scheduler
+        prompt = self.prompt_text.get("1.0", "end-1c").strip() # "end-1c" skips the newline Text always appends
 
         interval_value_str = self.interval_value_var.get().strip()
         interval_unit = self.interval_unit_var.get()
         search_internet = self.search_internet_var.get()
 
-        if not interval_value_str.isdigit() or int(interval_value_str) <= 0:
+        # isascii() too: str.isdigit() accepts characters like superscripts that int() rejects
+        if not (interval_value_str.isascii() and interval_value_str.isdigit()) or int(interval_value_str) <= 0:
             messagebox.showerror("Error", "Interval value must be a positive number.")
             return
 
@@ -491,9 +862,9 @@ class App:
         # It expects "N unit(s)", so singular/plural might need adjustment or flexible parsing there.
         # For simplicity, using singular for now, assuming scheduler handles it or is adapted.
         # Example: "minutes" -> "minute" for "1 minute" vs "2 minutes"
-        # The schedule library is flexible with plurals for its direct methods.
+        # scheduler.py's parser accepts either singular or plural units.
 
-        # Map GUI display names to what 'schedule' library might expect or our parser.
+        # Map GUI display names to what our parser expects.
         unit_mapping = {
             "Minutes": "minutes",
             "Hours": "hours",
@@ -503,6 +874,9 @@ class App:
         parsed_unit = unit_mapping.get(interval_unit, "minutes") # Default to minutes if something is wrong
 
         interval_str = f"{interval_value} {parsed_unit}"
+        if not scheduler.is_valid_interval(interval_str): # Never let an unparseable interval reach the config
+            messagebox.showerror("Error", f"Invalid interval: '{interval_str}'.")
+            return
         
         # Use global API key and recipient email by default for a task
         # These could be overridden per task if UI is expanded later
@@ -521,7 +895,7 @@ class App:
         # Interval check is implicitly handled by the new input method's structure
         # and the initial digit check.
 
-        task_id = str(uuid.uuid4()) # Generate a unique ID for the task
+        task_id = uuid.uuid4().hex # Generate a unique ID for the task (no hyphen formatting)
         new_task = {
             "id": task_id,
             "prompt": prompt,
@@ -535,9 +909,10 @@ class App:
         if config_manager.add_task_to_config(new_task):
             self.tasks.append(new_task) # Update local cache
             self.update_tasks_listbox()
-            messagebox.showinfo("Success", f"Task '{prompt[:30]}...' added.")
+            self.show_status(f"Added: {prompt[:30]}...")
             # Clear input fields
-            self.prompt_text.delete("1.0", tk.END)
+            if self.prompt_text.index("end-1c") != "1.0": # Skip the Tcl call if already empty
+                self.prompt_text.delete("1.0", tk.END)
             self.interval_value_var.set("1") # Reset to default
             self.interval_unit_combobox.set(self.interval_units[0]) # Reset to default
             self.search_internet_var.set(False)
@@ -560,21 +935,14 @@ class App:
 
             if task_executed_immediately:
                 print(f"GUI: Task '{task_id}' executed immediately and scheduled.")
-                # Refresh task list to show updated status (last run, etc.)
-                self.update_tasks_listbox()
-                # If a task was selected, its details might need an update.
-                # Re-selecting the newly added task could be an option, or just refresh all.
-                # For now, a general update_tasks_listbox should refresh countdowns.
-                # To update details like "Last Sent", we might need to refresh self.tasks from config
-                # and then call on_task_select if the new task is made active.
-                # Let's ensure self.tasks is fresh before updating listbox.
-                self.tasks = config_manager.get_tasks() # Refresh local cache
-                self.update_tasks_listbox()
+                # Refresh task list to show updated status (last run, etc.); the immediate run
+                # recorded its details in the config, so re-read it.
+                self.update_tasks_listbox(refresh_from_disk=True)
 
                 # If the scheduler wasn't running, and we just added+ran a task,
                 # it's now scheduled. If it *was* running, run_task_now_and_schedule
                 # should have added it to the existing schedule.
-                if not (scheduler._scheduler_thread and scheduler._scheduler_thread.is_alive()):
+                if not _scheduler_running():
                     # If scheduler was stopped, and we added a task, it's now in schedule's list
                     # but the scheduler thread itself isn't running.
                     # We might want to auto-start it, or rely on the user to press "Start Scheduler".
@@ -613,16 +981,11 @@ class App:
             messagebox.showerror("Error", "Failed to save task to configuration.")
             
     def remove_selected_task(self):
-        selected_indices = self.tasks_listbox.curselection()
-        if not selected_indices:
+        selected_index = self._selected_task_index()
+        if selected_index is None:
             messagebox.showwarning("No Selection", "Please select a task to remove.")
             return
 
-        # Assuming single selection for now
-        selected_index = selected_indices[0]
-        
-        # Need to map listbox index to task ID, as listbox can be filtered/sorted later
-        # For now, assuming direct mapping from self.tasks
         if 0 <= selected_index < len(self.tasks):
             task_to_remove = self.tasks[selected_index]
             task_id = task_to_remove.get("id")
@@ -635,67 +998,166 @@ class App:
                                          f"Are you sure you want to remove task:\n{task_to_remove['prompt'][:50]}...?")
             if confirm:
                 if config_manager.remove_task_from_config(task_id):
-                    self.tasks.pop(selected_index) # Update local cache
+                    # Update local cache. Look the task up by ID again: the periodic refresh may
+                    # have re-read self.tasks while the confirmation dialog was open.
+                    current_index = self._task_index_by_id(task_id)
+                    if current_index is not None:
+                        self.tasks.pop(current_index)
                     self.update_tasks_listbox()
-                    messagebox.showinfo("Success", "Task removed.")
-                    # If scheduler is running, we might need to tell it to update/remove this task
-                    if scheduler._scheduler_thread and scheduler._scheduler_thread.is_alive():
-                         # scheduler.remove_task(task_id) # This is good, but a full restart is safer for consistency
-                         print(f"GUI: Scheduler running, restarting after removing task {task_id}")
-                         self.stop_scheduler_gui(silent=True)
-                         self.start_scheduler_gui(silent=True)
-                         # Update button states as start/stop might change them
-                         self.start_button.config(state=tk.DISABLED)
-                         self.stop_button.config(state=tk.NORMAL)
-                         self.add_task_button.config(state=tk.DISABLED)
-                         self.remove_task_button.config(state=tk.DISABLED)
+                    self.show_status(f"Removed: {task_to_remove['prompt'][:30]}...")
+                    # If scheduler is running, hand the removal to its thread instead of
+                    # touching its jobs (or restarting it) from the UI thread
+                    if _scheduler_running():
+                         print(f"GUI: Scheduler running, queueing removal of task {task_id}")
+                         import scheduler
+                         scheduler.post_command("remove", task_id)
                 else:
                     messagebox.showerror("Error", "Failed to remove task from configuration.")
         else:
             messagebox.showerror("Error", "Invalid task selection.")
 
 
-    def update_tasks_listbox(self):
-        self.tasks_listbox.delete(0, tk.END)
-        # self.tasks should be kept in sync with config_manager's tasks
-        self.tasks = config_manager.get_tasks() # Refresh from source of truth config
-        print(f"DEBUG: gui.py -> update_tasks_listbox -> self.tasks from config: {self.tasks}")
+    def update_tasks_listbox(self, refresh_from_disk=False):
+        """
+        Redraws the task view from self.tasks. Pass refresh_from_disk=True to re-read the
+        tasks from config first; handlers that just updated self.tasks themselves don't need to.
+        """
+        if refresh_from_disk:
+            # Refresh from source of truth config, skipping the copy if it hasn't changed since
+            # the last refresh (handlers only ever change self.tasks alongside the config)
+            tasks, self._tasks_generation = config_manager.get_tasks_if_changed(self._tasks_generation)
+            if tasks is not None:
+                self.tasks = tasks
         
         # Get current statuses from the running scheduler if it's active
         scheduler_statuses = {}
-        if scheduler._scheduler_thread and scheduler._scheduler_thread.is_alive():
-            live_tasks_info = scheduler.list_tasks() # This now returns dicts with 'id' and 'time_remaining_str'
-            for info in live_tasks_info:
-                scheduler_statuses[info["id"]] = info["time_remaining_str"]
-        print(f"DEBUG: gui.py -> update_tasks_listbox -> scheduler_statuses: {scheduler_statuses}")
-
-        for i, task in enumerate(self.tasks):
-            task_id = task.get("id", "NoID")
-            status_icon = "✓" if task.get("enabled", True) else "✗"
-            prompt_preview = task['prompt'][:30]
-            interval_info = task['interval']
-
-            countdown_str = ""
-            if task.get("enabled", True): # Only show countdown for enabled tasks
-                if task_id in scheduler_statuses:
-                    countdown_str = f"(Next: {scheduler_statuses[task_id]})"
-                elif scheduler._scheduler_thread and scheduler._scheduler_thread.is_alive():
-                    # Task is enabled but not in live scheduler (e.g., just added, scheduler not refreshed yet)
-                    countdown_str = "(Pending schedule)"
-                else:
-                    countdown_str = "(Scheduler stopped)"
+        scheduler_running = _scheduler_running()
+        if scheduler_running:
+            import scheduler
+            scheduler_statuses = scheduler.task_countdowns() # {task id: time remaining string}
+        self._scheduler_statuses = scheduler_statuses
+        self._scheduler_running = scheduler_running
+
+        self._iid_to_index = {}
+        self._enabled_tasks = [] # Prebuilt here so start_scheduler_gui doesn't re-filter
+        rows = []
+        for index, task in enumerate(self.tasks):
+            if task.get("enabled", True):
+                self._enabled_tasks.append(task)
+            iid = task.get("id") or f"task-{index}"
+            if iid in self._iid_to_index: # Duplicate ID in a hand-edited config; keep rows distinct
+                iid = f"{iid}-{index}"
+            self._iid_to_index[iid] = index
+            rows.append((iid, self._format_task(task)))
+        wanted = [iid for iid, _ in rows]
+        children = list(self.tasks_tree.get_children())
+        if children != wanted:
+            # Patch the rows that changed instead of re-inserting all of them; deleting and
+            # re-inserting every row flickers and loses the selection.
+            removed = [iid for iid in children if iid not in self._iid_to_index]
+            if removed:
+                self.tasks_tree.delete(*removed)
+                for iid in removed:
+                    del self._row_values[iid]
+                    self._stale_rows.pop(iid, None)
+            surviving = [iid for iid in children if iid in self._iid_to_index]
+            if surviving == wanted[:len(surviving)]:
+                # Rows were only removed and/or appended (what the add and remove handlers do)
+                for iid, values in rows[len(surviving):]:
+                    self.tasks_tree.insert("", tk.END, iid=iid, values=values)
+                    self._row_values[iid] = values
+                    self._stale_rows.pop(iid, None)
+            else:
+                # Tasks were reordered (e.g. the config was edited by hand): move existing rows
+                # into place, which keeps their selection, and insert the new ones where they go.
+                existing = set(surviving)
+                for position, (iid, values) in enumerate(rows):
+                    if iid in existing:
+                        self.tasks_tree.move(iid, "", position)
+                    else:
+                        self.tasks_tree.insert("", position, iid=iid, values=values)
+                        self._row_values[iid] = values
+                        self._stale_rows.pop(iid, None)
+        self._row_order = wanted
+
+        # Existing rows: only touch the cells that changed (e.g. countdowns), and only for rows
+        # in view. Off-screen changes wait in _stale_rows until the row is scrolled into view,
+        # so a tick costs O(visible rows) Tk calls however many tasks there are.
+        visible = self._visible_row_range(*self.tasks_tree.yview())
+        for position, (iid, values) in enumerate(rows):
+            if self._row_values.get(iid) == values:
+                self._stale_rows.pop(iid, None)
+            elif position in visible:
+                self.tasks_tree.item(iid, values=values)
+                self._row_values[iid] = values
+                self._stale_rows.pop(iid, None)
+            else:
+                self._stale_rows[iid] = values
 
+    def _visible_row_range(self, first, last):
+        """Positions of the rows in view, given the task view's yview fractions (with a row of slack)."""
+        count = len(self._row_order)
+        return range(max(0, int(float(first) * count) - 1), min(count, math.ceil(float(last) * count) + 1))
 
-            display_text = f"{status_icon} {task_id[:8]} | {prompt_preview}... | {interval_info} {countdown_str}"
-            if task['search_internet']:
-                display_text += " (Net)"
-            self.tasks_listbox.insert(tk.END, display_text)
+    def _on_tasks_tree_scrolled(self, first, last):
+        """yscrollcommand of the task view: moves the scrollbar and shows rows scrolled into view."""
+        self._tasks_scrollbar.set(first, last)
+        if not self._stale_rows:
+            return
+        for position in self._visible_row_range(first, last):
+            iid = self._row_order[position]
+            values = self._stale_rows.pop(iid, None)
+            if values is not None:
+                self.tasks_tree.item(iid, values=values)
+                self._row_values[iid] = values
+
+    def _refresh_task_row(self, iid):
+        """Redraws one row of the task view from its task in self.tasks."""
+        values = self._format_task(self.tasks[self._iid_to_index[iid]])
+        self._stale_rows.pop(iid, None)
+        if self._row_values.get(iid) != values:
+            self.tasks_tree.item(iid, values=values)
+            self._row_values[iid] = values
+
+    def _task_index_by_id(self, task_id):
+        """Index into self.tasks of the task with this ID, or None. O(1) via the row keys."""
+        index = self._iid_to_index.get(task_id) # Row iids are the task IDs
+        if index is not None and index < len(self.tasks) and self.tasks[index].get("id") == task_id:
+            return index
+        return next((i for i, task in enumerate(self.tasks) if task.get("id") == task_id), None)
+
+    def _selected_task_index(self):
+        """Index into self.tasks of the selected row, or None if nothing is selected."""
+        selection = self.tasks_tree.selection()
+        if not selection:
+            return None
+        return self._iid_to_index.get(selection[0])
+
+    def _format_task(self, task):
+        """Returns the row values for a task, including its countdown from the last scheduler poll."""
+        task_id = task.get("id", "NoID")
+        enabled = task.get("enabled", True)
+        status, id_prefix, prompt, interval, net = _task_display_parts(
+            enabled, task_id[:8], task['prompt'][:30], task['interval'], bool(task['search_internet']))
+
+        countdown_str = ""
+        if enabled: # Only show countdown for enabled tasks
+            if task_id in self._scheduler_statuses:
+                countdown_str = self._scheduler_statuses[task_id]
+            elif self._scheduler_running:
+                # Task is enabled but not in live scheduler (e.g., just added, scheduler not refreshed yet)
+                countdown_str = "Pending schedule"
+            else:
+                countdown_str = "Scheduler stopped"
+        return (status, id_prefix, prompt, interval, countdown_str, net)
 
     def start_scheduler_gui(self, silent=False): # Added silent parameter
+        import scheduler
         self.save_main_config() # Save current API key and email before starting
 
-        # Ensure self.tasks is up-to-date with the configuration file
-        self.tasks = config_manager.get_tasks()
+        # Ensure self.tasks (and the enabled-task view built alongside the rows) is up-to-date
+        # with the configuration file
+        self.update_tasks_listbox(refresh_from_disk=True)
         print(f"DEBUG: gui.py -> start_scheduler_gui -> self.tasks reloaded: {self.tasks}")
 
         current_api_key = self.api_key_var.get()
@@ -710,7 +1172,7 @@ class App:
             messagebox.showerror("Error", "Default Recipient Email is required in Configuration.")
             return
         
-        active_tasks = [task for task in self.tasks if task.get("enabled", True)]
+        active_tasks = self._enabled_tasks
         if not active_tasks:
             if not silent: # Only show message if not silent
                 messagebox.showinfo("Info", "No enabled tasks to schedule.")
@@ -724,8 +1186,9 @@ class App:
             current_smtp_config
         )
         print(f"DEBUG: gui.py -> start_scheduler_gui -> Called scheduler.start_scheduler_thread with active_tasks: {active_tasks}")
+        self._rearm_periodic_update() # Switch from the idle interval to live countdowns right away
         if not silent: # Only show message if not silent
-            messagebox.showinfo("Scheduler", "Scheduler started with enabled tasks.")
+            self.show_status("Scheduler started with enabled tasks.")
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         # With run_task_now_and_schedule, we might allow adding/removing tasks while scheduler is running
@@ -735,9 +1198,10 @@ class App:
 
 
     def stop_scheduler_gui(self, silent=False): # Ensure this matches the definition used earlier
+        import scheduler
         scheduler.stop_scheduler_thread()
         if not silent: # Only show message if not silent
-            messagebox.showinfo("Scheduler", "Scheduler stopped.")
+            self.show_status("Scheduler stopped.")
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         self.add_task_button.config(state=tk.NORMAL)
@@ -749,7 +1213,10 @@ class App:
         if messagebox.askokcancel("Quit", "Do you want to quit?\nThis will stop the scheduler if it's running."):
             print("DEBUG: gui.py -> on_closing() - User chose to quit.") # DEBUG LOG
             self.save_main_config() # Save any changes in API key/email
-            if scheduler._scheduler_thread and scheduler._scheduler_thread.is_alive():
+            self._flush_config() # Write now; pending after() callbacks die with the window
+            config_manager.flush() # Including saves already queued on the writer thread
+            self._close_email_sender()
+            if _scheduler_running():
                 print("DEBUG: gui.py -> on_closing() is calling stop_scheduler_gui()") # DEBUG LOG
                 self.stop_scheduler_gui()
             self.master.destroy()
@@ -1,8 +1,29 @@
 # main.py
+import logging
+import logging.handlers
+import os
+import queue
 import tkinter as tk
 from gui import App
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = App(root)
-    root.mainloop()
+    # email_sender, gemini_client and scheduler report through `logging`; DEBUG adds per-connection
+    # and per-step task detail. Set LOG_LEVEL (e.g. LOG_LEVEL=DEBUG) to change the level; messages
+    # below it are never formatted.
+    log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+    # Records are only queued by the logging thread (GUI, scheduler, task workers); one listener
+    # thread writes them out, so task workers never wait on each other for stderr.
+    log_queue = queue.SimpleQueue()
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s: %(message)s"))
+    log_listener = logging.handlers.QueueListener(log_queue, console_handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s")) # Only merges the arguments; console_handler does the rest
+    logging.basicConfig(level=getattr(logging, log_level, logging.INFO), handlers=[queue_handler])
+    log_listener.start()
+    try:
+        root = tk.Tk()
+        app = App(root)
+        root.mainloop()
+    finally:
+        log_listener.stop() # Writes out whatever is still queued
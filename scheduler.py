@@ -1,207 +1,614 @@
 # scheduler.py
+import re
+import html
+import logging
 import time
+import queue
 import threading
-import schedule
+import heapq
+import itertools
+import functools
 import datetime # Added for next_run calculations
-import traceback # For detailed error logging
-
-# This will hold the jobs managed by the schedule library
-_jobs = []
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# A persistent fault (a bad API key, an unreachable server) raises the same exception on every
+# run. Its traceback is logged once per _TRACEBACK_REPEAT_SECONDS; repeats in between get a
+# one-line error with a count. {(exception type, first line of message): (logged at, repeats)}
+_TRACEBACK_REPEAT_SECONDS = 60
+_logged_tracebacks = {}
+_logged_tracebacks_lock = threading.Lock()
+
+def _log_exception(exc, msg, *args):
+    """logger.exception(msg, *args) for the exception being handled (exc), minus repeated tracebacks."""
+    key = (type(exc), str(exc).partition("\n")[0])
+    now = time.monotonic()
+    with _logged_tracebacks_lock:
+        logged_at, repeats = _logged_tracebacks.get(key, (None, 0))
+        repeated = logged_at is not None and now - logged_at < _TRACEBACK_REPEAT_SECONDS
+        if repeated:
+            repeats += 1
+            _logged_tracebacks[key] = (logged_at, repeats)
+        else:
+            if len(_logged_tracebacks) >= 256: # Many distinct errors: forget them rather than grow
+                _logged_tracebacks.clear()
+            _logged_tracebacks[key] = (now, 0)
+    if repeated:
+        logger.error(msg + " (repeat %d within %ss; traceback logged earlier)", *args, repeats, _TRACEBACK_REPEAT_SECONDS)
+    else:
+        logger.exception(msg, *args)
+
+# Scheduled jobs: _task_defs maps each task ID to its live _Job, and _heap is a min-heap of
+# (deadline on time.monotonic(), tie-breaker, _Job) so the next due job is always _heap[0].
+# Removing a task only drops it from _task_defs; its heap entry is skipped when it surfaces.
+_task_defs = {}
+_heap = []
+_heap_sequence = itertools.count() # Tie-breaker for equal deadlines; _Job objects don't compare
+_stale_heap_entries = 0 # Entries of removed tasks still in _heap; compacted once they outnumber live ones
+_schedule_generation = 0 # Bumped whenever tasks are added or removed (see task_countdowns)
 _scheduler_thread = None
 _stop_event = threading.Event()
+_running = threading.Event() # Set while the scheduler thread is running; read by is_running()
+# Interrupts the scheduler thread's sleep: set on stop, when a command is posted and when a job is
+# added, so the thread never sleeps past something new.
+_wake_event = threading.Event()
+# Bounds for that sleep. The upper bound keeps the loop alive for jobs added without a wakeup.
+_MIN_WAIT_SECONDS = 0.05
+_MAX_WAIT_SECONDS = 60
+# Serializes changes to _task_defs/_heap with the scheduler thread's _run_due_jobs(). Due jobs only
+# hand their task to _task_executor, so the lock is never held across a Gemini call or SMTP send.
+_schedule_lock = threading.RLock()
+# Runs due tasks off the scheduler thread, so one slow task doesn't delay the others. Created by
+# start_scheduler_thread and shut down when the scheduler loop exits.
+_TASK_WORKERS = 4
+_task_executor = None
+_task_futures = {} # {task_id: Future of its latest run}, to skip overlapping runs and cancel on removal
+_task_futures_lock = threading.Lock()
+# Serializes the config read-modify-write that records a task's last run, now that runs overlap.
+# Also guards the batch below.
+_last_run_lock = threading.Lock()
+# While the scheduler runs, task results are collected here as {task_id: (response, sent time ISO)}
+# and written with one config_manager.bulk_update_last_run() call every _LAST_RUN_FLUSH_SECONDS
+# (and on shutdown), instead of one config save per task run
+_LAST_RUN_FLUSH_SECONDS = 5
+_pending_last_runs = {}
+_pending_last_runs_due = None # time.monotonic() by which the scheduler loop writes the batch
+_batch_last_runs = False # Set by start_scheduler_thread; cleared by the loop's final flush
+# Requests from other threads (e.g. the GUI), applied by the scheduler thread between ticks
+_command_queue = queue.SimpleQueue()
+# Notifications for the GUI, e.g. ("task_ran", task_id), collected with poll_events(). Bounded so
+# events nobody reads (no GUI attached) can't pile up.
+_event_queue = queue.Queue(maxsize=1000)
 
 # Placeholder for functions that will be called by the scheduler
 # These would typically interact with gemini_client and email_sender
 from gemini_client import GeminiClient # Import at module level
 from email_sender import EmailSender # Import at module level
+import config_manager # Likewise; task runs record their results through it
+
+# Pools of idle persistent EmailSenders, keyed by their SMTP settings, so tasks firing close
+# together reuse authenticated sessions instead of each opening one (EmailSender reconnects by
+# itself once it has sat idle, and rotates a session after max_per_connection messages). A send
+# checks a sender out, so task runs sending at the same time each get their own session; up to
+# _SMTP_POOL_SIZE idle ones are kept per server, one per task worker.
+_email_senders = {} # {settings: [idle EmailSender, ...]}
+_email_senders_lock = threading.Lock()
+_email_senders_epoch = 0 # Bumped by _close_email_senders; senders checked out before then are closed on return
+_SMTP_POOL_SIZE = _TASK_WORKERS
+# Cached SMTP sessions unused for this long are closed by the scheduler loop rather than left
+# open on the server until the next run
+_SMTP_IDLE_SECONDS = 100
+
+@contextmanager
+def _pooled_email_sender(smtp_config):
+    """
+    Checks a persistent EmailSender for smtp_config (from _prepare_smtp_config) out of the pool,
+    creating one if none is idle, and puts it back afterwards.
+    """
+    sig = (smtp_config["server"], smtp_config["port"], smtp_config["user"], smtp_config["password"], # Port already an int
+           smtp_config.get("use_tls", True), smtp_config.get("use_ssl", False))
+    with _email_senders_lock:
+        idle = _email_senders.get(sig)
+        sender = idle.pop() if idle else None
+        epoch = _email_senders_epoch
+    if sender is None:
+        server, port, user, password, use_tls, use_ssl = sig
+        sender = EmailSender(
+            smtp_server=server,
+            smtp_port=port,
+            smtp_user=user,
+            smtp_password=password,
+            use_tls=use_tls,
+            use_ssl=use_ssl, # Pass the new SSL setting
+            persistent=True,
+            max_idle_seconds=_SMTP_IDLE_SECONDS,
+            max_deadletter=0 # Nothing here resends; a failed send is recorded in the task's last run instead
+        )
+    try:
+        yield sender
+    finally:
+        with _email_senders_lock:
+            idle = _email_senders.setdefault(sig, [])
+            keep = epoch == _email_senders_epoch and len(idle) < _SMTP_POOL_SIZE
+            if keep:
+                idle.append(sender) # Most recently used on top, so the warmest session goes out next
+        if not keep:
+            sender.close()
+
+def _close_senders(senders):
+    """Closes each sender's session. Sends QUIT, so never called holding _email_senders_lock."""
+    for sender in senders:
+        sender.close()
+
+def _close_idle_email_senders():
+    """
+    Takes pooled senders idle past _SMTP_IDLE_SECONDS out of the pool and closes their sessions
+    on the task pool, so a server slow to answer QUIT holds up neither the scheduler loop nor the
+    lock task runs need to check senders out. Senders checked out are busy, not idle.
+    """
+    expired = []
+    with _email_senders_lock:
+        for idle in _email_senders.values():
+            kept = []
+            for sender in idle:
+                (expired if sender.is_idle() else kept).append(sender)
+            idle[:] = kept
+    if not expired:
+        return
+    with _task_futures_lock:
+        executor = _task_executor
+    try:
+        if executor is not None:
+            executor.submit(_close_senders, expired)
+            return
+    except RuntimeError: # Pool shutting down
+        pass
+    _close_senders(expired)
+
+def _close_email_senders():
+    """Closes and forgets the pooled EmailSenders' SMTP sessions; ones in use are closed when returned."""
+    global _email_senders_epoch
+    with _email_senders_lock:
+        _email_senders_epoch += 1
+        senders = [sender for idle in _email_senders.values() for sender in idle]
+        _email_senders.clear()
+    _close_senders(senders)
+
+# GeminiClients reused across task runs, keyed by API key. A client holds no per-call state, so
+# runs on different task workers can share one.
+_gemini_clients = {}
+_gemini_clients_lock = threading.Lock()
+
+def _get_gemini_client(api_key):
+    """Returns the cached GeminiClient for api_key, creating it on first use."""
+    with _gemini_clients_lock:
+        client = _gemini_clients.get(api_key)
+        if client is None:
+            client = GeminiClient(api_key=api_key)
+            if client.model is not None: # Not cached if setup failed, so the next run retries it
+                _gemini_clients[api_key] = client
+        return client
+
+def _clear_gemini_clients():
+    with _gemini_clients_lock:
+        _gemini_clients.clear()
+
+# Task result email body, formatted once per run; every field is HTML-escaped before it goes in
+_RESULT_HTML_TEMPLATE = ("<html><body><h1>{heading}</h1><p><b>Task ID:</b> {task_id}</p><p><b>Prompt:</b> {prompt}</p>"
+                         "<hr><h3>Response:</h3><p>{response}</p></body></html>")
+
+def _task_result_html(heading, task_id, prompt, response):
+    """HTML body of a task result email, with the response's line breaks kept as <br>."""
+    return _RESULT_HTML_TEMPLATE.format(heading=heading, task_id=html.escape(str(task_id)), prompt=html.escape(prompt),
+                                        response="<br>".join(html.escape(response).splitlines()))
+
+def _prepare_smtp_config(smtp_config):
+    """
+    Returns a copy of smtp_config with its port as an int, or None if it lacks a server, user or
+    valid port (tasks then skip the email). Done once when a task is scheduled, not on every run.
+    """
+    if not (smtp_config and smtp_config.get("server") and smtp_config.get("user")):
+        return None
+    try:
+        port = int(smtp_config["port"])
+    except (KeyError, TypeError, ValueError):
+        logger.error("Invalid SMTP port %r. Tasks will skip sending email.", smtp_config.get("port"))
+        return None
+    return {**smtp_config, "port": port}
 
-def _task_execution_function(task_id, prompt, search_internet, email_to, api_key, smtp_config):
+def _task_execution_function(task_id, prompt, search_internet, email_to, api_key, smtp_config, cache_ttl=0):
     """
     This function is what the scheduler will execute for each task.
-    1. Get response from Gemini (using gemini_client)
+    1. Get response from Gemini (using gemini_client), reusing a cached response for the same
+       prompt if it is at most cache_ttl seconds old (0, the default, always asks Gemini)
     2. Send email with the response (using email_sender)
     """
-    print(f"Scheduler INFO: Executing task '{task_id}' at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"  Task Details - Prompt: '{prompt}', Search Internet: {search_internet}, Email To: {email_to}")
+    logger.info("Executing task '%s'", task_id) # The log record carries the timestamp
+    logger.debug("Task '%s' details - Prompt: '%s', Search Internet: %s, Email To: %s", task_id, prompt, search_internet, email_to)
     
     # --- Gemini Interaction ---
     gemini_interaction_successful = False
     response = ""
     try:
-        print(f"Scheduler INFO: Task '{task_id}' - Initializing GeminiClient.")
-        gemini = GeminiClient(api_key=api_key)
-        print(f"Scheduler INFO: Task '{task_id}' - Requesting response from Gemini.")
-        response = gemini.get_gemini_response(prompt, search_internet)
+        gemini = _get_gemini_client(api_key)
+        logger.debug("Task '%s' - Requesting response from Gemini.", task_id)
+        response = gemini.get_gemini_response(prompt, search_internet, cache_ttl=cache_ttl)
 
         if response and not response.startswith("Error:"):
             gemini_interaction_successful = True
-            print(f"Scheduler SUCCESS: Task '{task_id}' - Successfully received response from Gemini: '{response[:100]}...'")
+            logger.info("Task '%s' - Successfully received response from Gemini: '%.100s...'", task_id, response)
         else:
             # GeminiClient already logs its own errors. This log indicates the scheduler's perspective.
-            print(f"Scheduler ERROR: Task '{task_id}' - Failed to get a valid response from Gemini. Received: '{response}'")
+            logger.error("Task '%s' - Failed to get a valid response from Gemini. Received: '%s'", task_id, response)
             # Optional: could set a default error response for the email if needed
             # response = "Error: Could not retrieve response from Gemini."
     except Exception as e_gemini:
-        print(f"Scheduler CRITICAL: Task '{task_id}' - Exception during Gemini interaction: {e_gemini}")
-        traceback.print_exc()
+        _log_exception(e_gemini, "Task '%s' - Exception during Gemini interaction: %s", task_id, e_gemini)
         response = f"Error: Exception occurred while contacting Gemini: {e_gemini}"
 
     if not gemini_interaction_successful:
         # If Gemini interaction failed, we might still want to send an email notification
         # or simply log and not send an email. For now, let's assume we send an email
         # with the error message if an email address is configured.
-        print(f"Scheduler WARNING: Task '{task_id}' - Proceeding to email step despite Gemini interaction failure.")
+        logger.warning("Task '%s' - Proceeding to email step despite Gemini interaction failure.", task_id)
         # If response is empty due to an exception, ensure it has some content.
         if not response: response = "Error: Unknown issue during Gemini interaction, no response obtained."
 
     # --- Email Sending ---
     email_sent_successfully = False
     if not email_to:
-        print(f"Scheduler INFO: Task '{task_id}' - No recipient email configured. Skipping email send.")
-    elif not (smtp_config and smtp_config.get("server") and smtp_config.get("user")):
-        print(f"Scheduler WARNING: Task '{task_id}' - SMTP configuration incomplete. Skipping email send. Config: {smtp_config}")
+        logger.info("Task '%s' - No recipient email configured. Skipping email send.", task_id)
+    elif not smtp_config: # Already run through _prepare_smtp_config by the caller
+        logger.warning("Task '%s' - SMTP configuration incomplete or invalid. Skipping email send.", task_id)
     else:
         try:
-            print(f"Scheduler INFO: Task '{task_id}' - Initializing EmailSender for {smtp_config.get('user')}@{smtp_config.get('server')}.")
-            sender = EmailSender(
-                smtp_server=smtp_config["server"],
-                smtp_port=int(smtp_config["port"]),
-                smtp_user=smtp_config["user"],
-                smtp_password=smtp_config["password"],
-                use_tls=smtp_config.get("use_tls", True),
-                use_ssl=smtp_config.get("use_ssl", False) # Pass the new SSL setting
-            )
             subject_prefix = "Gemini Task Result"
             if not gemini_interaction_successful:
                  subject_prefix = "Gemini Task Alert - Error"
             subject = f"{subject_prefix}: {prompt[:30]}..."
 
-            body_html = f"<html><body><h1>{subject_prefix}</h1><p><b>Task ID:</b> {task_id}</p><p><b>Prompt:</b> {prompt}</p><hr><h3>Response:</h3><p>{response.replace('n', '<br>')}</p></body></html>"
+            body_html = _task_result_html(subject_prefix, task_id, prompt, response)
             body_text = f"{subject_prefix}\nTask ID: {task_id}\nPrompt: {prompt}\n\nResponse:\n{response}"
 
-            print(f"Scheduler INFO: Task '{task_id}' - Attempting to send email to {email_to} with subject '{subject}'.")
-            if sender.send_email(email_to, subject, body_html, body_text):
-                print(f"Scheduler SUCCESS: Task '{task_id}' - Email successfully sent to {email_to}.")
+            logger.debug("Task '%s' - Attempting to send email to %s with subject '%s'.", task_id, email_to, subject)
+            with _pooled_email_sender(smtp_config) as email_sender:
+                logger.debug("Task '%s' - Using EmailSender for %s@%s.", task_id, smtp_config.get('user'), smtp_config.get('server'))
+                sent = email_sender.send_email(email_to, subject, body_html, body_text)
+            if sent:
+                logger.info("Task '%s' - Email successfully sent to %s.", task_id, email_to)
                 email_sent_successfully = True
             else:
                 # EmailSender logs specific errors. This is the scheduler's summary.
-                print(f"Scheduler ERROR: Task '{task_id}' - Failed to send email to {email_to} (EmailSender returned false). Check EmailSender logs.")
+                logger.error("Task '%s' - Failed to send email to %s (EmailSender returned false). Check EmailSender logs.", task_id, email_to)
 
-        except ImportError: # Should not happen if EmailSender imported at module level
-            print(f"Scheduler CRITICAL: Task '{task_id}' - EmailSender module not found during task execution. This is unexpected.")
         except KeyError as e_key:
-            print(f"Scheduler ERROR: Task '{task_id}' - Missing key in smtp_config: {e_key}. Cannot send email.")
+            logger.error("Task '%s' - Missing key in smtp_config: %s. Cannot send email.", task_id, e_key)
+        except ValueError as e_value: # Non-numeric port or settings rejected by EmailSender
+            logger.error("Task '%s' - Invalid SMTP configuration: %s. Cannot send email.", task_id, e_value)
         except Exception as e_email:
-            print(f"Scheduler CRITICAL: Task '{task_id}' - An unexpected error occurred during email sending: {e_email}")
-            traceback.print_exc()
+            _log_exception(e_email, "Task '%s' - An unexpected error occurred during email sending: %s", task_id, e_email)
 
     # --- Update Config with Last Run Details (if email was intended and successful, or even if Gemini failed but email was attempted) ---
     # We update config if the Gemini part produced a response (even an error string)
     # and an email attempt was made (or would have been made if configured).
     # This helps track that the task ran, regardless of full success.
     if response: # If there's any response (success or error string from Gemini part)
+        current_time_iso = datetime.datetime.now().isoformat()
+        if _queue_last_run(task_id, response, current_time_iso):
+            logger.info("Task '%s' execution finished.", task_id)
+            return # "task_ran" is posted once the batch is written
         try:
-            import config_manager # Local import for safety, though less critical now
-            current_time_iso = datetime.datetime.now().isoformat()
             # Save the Gemini response (which might be an error message) and the time
-            print(f"Scheduler INFO: Task '{task_id}' - Attempting to update last run details in config.")
-            if config_manager.update_task_last_run_details(task_id, response, current_time_iso):
-                print(f"Scheduler INFO: Task '{task_id}' - Last run details (response/time) updated in config.")
+            logger.debug("Task '%s' - Attempting to update last run details in config.", task_id)
+            with _last_run_lock:
+                updated = config_manager.update_task_last_run_details(task_id, response, current_time_iso)
+            if updated:
+                logger.debug("Task '%s' - Last run details (response/time) updated in config.", task_id)
+            else:
+                logger.warning("Task '%s' - Failed to update last run details in config (task ID not found or save error).", task_id)
+        except Exception as e_conf:
+            _log_exception(e_conf, "Task '%s' - Unexpected error updating task details in config: %s", task_id, e_conf)
+
+    _post_event("task_ran", task_id)
+    logger.info("Task '%s' execution finished.", task_id)
+
+
+def _queue_last_run(task_id, response, sent_time_iso):
+    """Adds a task's last run details to the pending batch. Returns False if not batching (scheduler stopped)."""
+    global _pending_last_runs_due
+    with _last_run_lock:
+        if not _batch_last_runs:
+            return False
+        _pending_last_runs[task_id] = (response, sent_time_iso) # A later run supersedes an unwritten one
+        first_in_batch = _pending_last_runs_due is None
+        if first_in_batch:
+            _pending_last_runs_due = time.monotonic() + _LAST_RUN_FLUSH_SECONDS
+    if first_in_batch:
+        _wake_event.set() # Let the scheduler loop shorten its sleep to the flush deadline
+    logger.debug("Task '%s' - Last run details queued for the next config write.", task_id)
+    return True
+
+def _flush_last_runs(final=False):
+    """
+    Writes the pending last run details in a single config save and posts their "task_ran"
+    events. final=True also stops batching, so runs finishing after shutdown write directly.
+    """
+    global _pending_last_runs_due, _batch_last_runs
+    with _last_run_lock:
+        pending = list(_pending_last_runs.items())
+        _pending_last_runs.clear()
+        _pending_last_runs_due = None
+        if final:
+            _batch_last_runs = False
+        if not pending:
+            return
+        try:
+            updated = config_manager.bulk_update_last_run(
+                [(task_id, response, sent_time_iso) for task_id, (response, sent_time_iso) in pending])
+            if updated:
+                logger.debug("Last run details of %d task(s) updated in config.", len(pending))
             else:
-                print(f"Scheduler WARNING: Task '{task_id}' - Failed to update last run details in config (task ID not found or save error).")
-        except ImportError:
-            print(f"Scheduler ERROR: Task '{task_id}' - ConfigManager module not found. Cannot update task details.")
+                logger.warning("Failed to update last run details in config (task IDs not found or save error).")
         except Exception as e_conf:
-            print(f"Scheduler ERROR: Task '{task_id}' - Unexpected error updating task details in config: {e_conf}")
-            traceback.print_exc()
+            _log_exception(e_conf, "Unexpected error updating task details in config: %s", e_conf)
+    for task_id, _ in pending:
+        _post_event("task_ran", task_id)
 
-    print(f"Scheduler INFO: --- Task '{task_id}' execution finished ---")
+def _bind_task_run(task_id, prompt, search_internet, email_to, api_key, smtp_config, cache_ttl=0):
+    """
+    Returns one run of the task as a no-argument callable. Bound once when the task is
+    scheduled (SMTP settings checked then too), so each run is a plain call with no kwargs
+    to repack on the way to the task pool.
+    """
+    return functools.partial(_task_execution_function, task_id, prompt, search_internet, email_to, api_key,
+                             _prepare_smtp_config(smtp_config), cache_ttl)
 
+def _submit_task_run(task_id, task_run):
+    """
+    Runs for each due job: queues task_run (from _bind_task_run) on _task_executor and returns,
+    so _run_due_jobs() isn't held up by it. A run is skipped while the task's previous one is still
+    going, so a task slower than its interval can't pile up runs.
+    """
+    with _task_futures_lock:
+        executor = _task_executor
+        if executor is None:
+            logger.warning("Task '%s' came due with no task workers running. Skipping this run.", task_id)
+            return
+        previous = _task_futures.get(task_id)
+        if previous is not None and not previous.done():
+            logger.warning("Task '%s' is still running from its last trigger. Skipping this run.", task_id)
+            return
+        _task_futures[task_id] = executor.submit(task_run)
+
+def _shutdown_task_executor():
+    """Stops accepting task runs and cancels queued ones; runs already underway finish on their own."""
+    global _task_executor
+    with _task_futures_lock:
+        executor, _task_executor = _task_executor, None
+        _task_futures.clear()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# "N unit" with an optional trailing "s" and, for days, an optional "[at] HH:MM";
+# compiled once at import rather than on every parse
+_INTERVAL_RE = re.compile(r"\s*([0-9]+)\s+(minute|hour|day|week)s?(?:\s+(?:at\s+)?([0-9]{1,2}):([0-9]{2}))?\s*",
+                          re.IGNORECASE)
+_INTERVAL_UNITS = {"minute": "minutes", "hour": "hours", "day": "days", "week": "weeks"}
+_UNIT_SECONDS = {"minutes": 60, "hours": 3600, "days": 86400, "weeks": 604800}
+_AT_TIME_UNITS = ("days",) # An "HH:MM" time of day only makes sense on day intervals (weeks would need a weekday)
+
+@functools.lru_cache(maxsize=256)
+def _split_interval(interval_str):
+    """
+    Returns (value, plural unit name, "HH:MM" or None) for a valid interval string, or
+    None. Cached: the same few strings are parsed on every scheduler start and GUI validation.
+    """
+    match = _INTERVAL_RE.fullmatch(interval_str)
+    if not match:
+        return None
+    value, unit, at_hour, at_minute = match.groups()
+    unit = _INTERVAL_UNITS[unit.lower()]
+    at_time = None
+    if at_hour is not None:
+        if unit not in _AT_TIME_UNITS or int(at_hour) > 23 or int(at_minute) > 59:
+            return None
+        at_time = f"{int(at_hour):02d}:{at_minute}"
+    return int(value), unit, at_time
+
+def is_valid_interval(interval_str):
+    """Returns True if interval_str is an interval _parse_interval accepts (e.g., "5 minutes")."""
+    parts = _split_interval(interval_str or "")
+    return parts is not None and parts[0] > 0
 
 def _parse_interval(interval_str):
     """
-    Parses an interval string in the format "N unit" (e.g., "5 minutes", "1 hour", "2 days", "3 weeks")
-    and configures a schedule object (e.g., schedule.every(N).minutes).
-    This configured schedule object is then returned, ready for a .do() call.
-    Returns a configured schedule.Scheduler object or None if parsing fails.
+    Parses an interval string in the format "N unit" (e.g., "5 minutes", "1 hour", "2 days", "3 weeks").
+    Day intervals may name a time of day, e.g. "1 day 08:30" or "1 day at 08:30".
+    Returns (interval in seconds, (hour, minute) or None), or None if parsing fails.
     
     Supported units: "minutes", "hours", "days", "weeks" (and their singular forms).
     The value N must be a positive integer.
     """
-    parts = interval_str.lower().split() # e.g., "5 minutes" -> ["5", "minutes"]
-    job = schedule.every()
-    
-    if len(parts) != 2:
-        print(f"Scheduler: Invalid interval format: '{interval_str}'. Expected 'N unit' (e.g., '10 minutes').")
+    parts = _split_interval(interval_str or "")
+    if not parts:
+        logger.error("Invalid interval format: '%s'. Expected 'N unit' (e.g., '10 minutes'). "
+                     "Supported units: minutes, hours, days, weeks.", interval_str)
         return None
 
-    try:
-        value = int(parts[0])
-        unit = parts[1]
-
-        if value <= 0:
-            print(f"Scheduler: Interval value must be a positive integer, got: {value} from '{interval_str}'")
-            return None
-
-        # Create a scheduler setup, e.g., schedule.every(value)
-        current_job_setup = schedule.every(value)
-
-        # Then chain the unit method, e.g., current_job_setup.minutes
-        if unit in ["minute", "minutes"]:
-            current_job_setup.minutes
-        elif unit in ["hour", "hours"]:
-            current_job_setup.hours
-        elif unit in ["day", "days"]:
-            current_job_setup.days
-            # Note: If specific times for daily tasks (e.g., "every day at 10:00") are needed,
-            # the GUI would need to provide this, and this parser would need to be extended.
-        elif unit in ["week", "weeks"]:
-            current_job_setup.weeks
-        else:
-            print(f"Scheduler: Unknown interval unit: '{unit}' in '{interval_str}'. Supported: minutes, hours, days, weeks.")
-            return None
-
-        return current_job_setup # This is a configured Scheduler object, not a Job yet.
-                                 # .do() will be called on this by the add_task function.
-    except ValueError: # Handles non-integer for value
-        print(f"Scheduler: Invalid interval number: '{parts[0]}' in '{interval_str}'. Must be an integer.")
-        return None
-    except Exception as e: # Catch-all for other unexpected errors during parsing
-        print(f"Scheduler: Unexpected error parsing interval '{interval_str}': {e}")
+    value, unit, at_time = parts
+    if value <= 0:
+        logger.error("Interval value must be a positive integer, got: %s from '%s'", value, interval_str)
         return None
+    if at_time:
+        hour, minute = at_time.split(":")
+        at_time = (int(hour), int(minute))
+    return value * _UNIT_SECONDS[unit], at_time
 
-def add_task(task_id, prompt, interval_str, search_internet, email_to, api_key, smtp_config):
+class _Job:
     """
-    Adds a new task to the scheduler.
+    One scheduled task: what to run (task_run, from _bind_task_run), how often, and when next.
+    deadline is on time.monotonic(), so clock changes don't move fixed intervals; next_run is the
+    same moment as a local datetime, for display, and next_run_iso its ISO string, formatted
+    once per reschedule rather than on every list_tasks() call.
+    """
+    __slots__ = ("task_id", "interval_str", "interval_seconds", "at_time", "task_run", "deadline", "next_run",
+                 "next_run_iso")
+
+    def __init__(self, task_id, interval_str, interval_seconds, at_time, task_run):
+        self.task_id = task_id
+        self.interval_str = interval_str
+        self.interval_seconds = interval_seconds
+        self.at_time = at_time
+        self.task_run = task_run
+        self.deadline = None
+        self.next_run = None
+        self.next_run_iso = None
+
+    def __str__(self):
+        return f"Every {self.interval_str} do task {self.task_id!r} (next run: {self.next_run})"
+
+    def schedule_next(self, now, previous_deadline=None):
+        """
+        Sets deadline/next_run to the job's next run after now (a time.monotonic() reading).
+        Fixed intervals stay on previous_deadline + interval, so a late wakeup doesn't push
+        every later run back; a run is never scheduled into the past, though (e.g. after a
+        sleep). Jobs with an at_time land on that local time of day.
+        """
+        now_dt = datetime.datetime.now()
+        if self.at_time is None:
+            deadline = now + self.interval_seconds
+            if previous_deadline is not None and now < previous_deadline + self.interval_seconds:
+                deadline = previous_deadline + self.interval_seconds
+            self.deadline = deadline
+            self.next_run = now_dt + datetime.timedelta(seconds=deadline - now)
+            self.next_run_iso = self.next_run.isoformat()
+            return
+        if previous_deadline is None or self.next_run is None: # First run: the next occurrence of the time of day
+            hour, minute = self.at_time
+            next_run = now_dt.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        else:
+            next_run = self.next_run + datetime.timedelta(seconds=self.interval_seconds)
+        while next_run <= now_dt: # Also skips runs missed while the machine slept
+            next_run += datetime.timedelta(days=1)
+        # astimezone() so the wait spans a DST change correctly
+        self.deadline = now + (next_run.astimezone() - now_dt.astimezone()).total_seconds()
+        self.next_run = next_run
+        self.next_run_iso = next_run.isoformat()
+
+def _push_job(job):
+    """Adds job to _heap at its deadline. Caller holds _schedule_lock."""
+    heapq.heappush(_heap, (job.deadline, next(_heap_sequence), job))
+
+def add_task(task_id, prompt, interval_str, search_internet, email_to, api_key, smtp_config, cache_ttl=0):
+    """
+    Adds a new task to the scheduler, replacing any job it already has.
     task_id: A unique identifier for the task.
+    cache_ttl: Seconds a Gemini response to the same prompt may be reused for; 0 disables.
     """
-    parsed_job = _parse_interval(interval_str)
-    if parsed_job:
-        # Using a lambda to pass arguments to the task function
+    global _schedule_generation
+    parsed = _parse_interval(interval_str)
+    if parsed:
+        interval_seconds, at_time = parsed
         # Each job needs its own set of arguments captured at the time of scheduling
-        job_instance = parsed_job.do(
-            _task_execution_function,
-            task_id=task_id,
-            prompt=prompt, 
-            search_internet=search_internet, 
-            email_to=email_to,
-            api_key=api_key,
-            smtp_config=smtp_config # This would be the global SMTP config
-        )
-        job_instance.tag(task_id) # Tag the job with its ID for later management
-        _jobs.append(job_instance)
-        print(f"Scheduler: Task '{task_id}' ({prompt[:20]}...) scheduled with interval '{interval_str}'. Job: {job_instance}")
+        job = _Job(task_id, interval_str, interval_seconds, at_time,
+                   _bind_task_run(task_id, prompt, search_internet, email_to, api_key, smtp_config, cache_ttl))
+        with _schedule_lock:
+            job.schedule_next(time.monotonic())
+            _forget_job(task_id)
+            _task_defs[task_id] = job
+            _push_job(job) # O(log N)
+            _schedule_generation += 1
+        _wake_event.set() # A running scheduler may be sleeping past this job's first run
+        logger.info("Task '%s' (%.20s...) scheduled with interval '%s'. Job: %s", task_id, prompt, interval_str, job)
         return True
     else:
-        print(f"Scheduler: Failed to schedule task '{task_id}' due to interval parsing error.")
+        logger.error("Failed to schedule task '%s' due to interval parsing error.", task_id)
         return False
 
+def _forget_job(task_id):
+    """
+    Drops task_id's job from _task_defs, leaving its heap entry to be skipped when it comes up.
+    Rebuilds the heap once such entries are the majority. Caller holds _schedule_lock.
+    """
+    global _stale_heap_entries, _heap
+    if _task_defs.pop(task_id, None) is None:
+        return
+    _stale_heap_entries += 1
+    if _stale_heap_entries > len(_heap) // 2:
+        _heap = [entry for entry in _heap if _task_defs.get(entry[2].task_id) is entry[2]]
+        heapq.heapify(_heap)
+        _stale_heap_entries = 0
+
 def remove_task(task_id):
     """Removes a task from the scheduler by its ID."""
-    schedule.clear(task_id) # Clears jobs with this specific tag
-    # Also remove from our internal _jobs list if necessary, though schedule.clear should handle it.
-    _jobs[:] = [j for j in _jobs if task_id not in j.tags]
-    print(f"Scheduler: Task '{task_id}' removed.")
+    global _schedule_generation
+    with _schedule_lock:
+        _forget_job(task_id)
+        _schedule_generation += 1
+    with _task_futures_lock:
+        queued_run = _task_futures.pop(task_id, None)
+    if queued_run is not None:
+        queued_run.cancel() # Only takes effect if the run hasn't started yet
+    logger.info("Task '%s' removed.", task_id)
+
+def _clear_jobs():
+    """Unschedules every task."""
+    global _stale_heap_entries, _schedule_generation
+    with _schedule_lock:
+        _task_defs.clear()
+        _heap.clear()
+        _stale_heap_entries = 0
+        _schedule_generation += 1
+
+def _format_seconds_remaining(seconds_left):
+    """Countdown string: "HH:MM:SS", "Running/Overdue" once due, or "N/A" for None (no next run)."""
+    if seconds_left is None:
+        return "N/A"
+    if seconds_left <= 0: # If the next run is in the past or now
+        return "Running/Overdue"
+    hours, remainder = divmod(int(seconds_left), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours:02}:{minutes:02}:{seconds:02}" # HH:MM:SS format
+
+def _task_status(task_id, job, now):
+    """
+    Status dict for one task's job, as returned by list_tasks and get_task_status_by_id. now is
+    a time.monotonic() sample, read once by the caller; the countdown is plain float arithmetic
+    against the job's deadline, with no datetime conversion per job.
+    """
+    return {
+        "id": task_id,
+        "next_run_iso": job.next_run_iso,
+        "time_remaining_str": _format_seconds_remaining(job.deadline - now),
+        "job_str": str(job) # Useful for debugging the scheduled job
+    }
+
+# Last task_countdowns() result as (computed at, _schedule_generation, countdowns). Reused for
+# a short while so several refreshes handling the same GUI event share one pass over the jobs.
+_COUNTDOWN_CACHE_SECONDS = 0.25
+_countdown_cache = (float("-inf"), -1, {})
+
+def task_countdowns():
+    """
+    Returns {task_id: time remaining string} for all scheduled jobs, using a single clock
+    sample. A lighter version of list_tasks for callers that refresh countdowns frequently:
+    it only does arithmetic on the jobs' monotonic deadlines against one time.monotonic()
+    reading, with no datetimes or dicts per job. Calls within _COUNTDOWN_CACHE_SECONDS of each other reuse the last
+    result unless jobs were added or removed in between.
+    """
+    global _countdown_cache
+    now = time.monotonic()
+    cached_at, cached_generation, countdowns = _countdown_cache
+    if 0 <= now - cached_at < _COUNTDOWN_CACHE_SECONDS and cached_generation == _schedule_generation:
+        return dict(countdowns)
+    generation = _schedule_generation
+    # tuple() snapshots the map in one step; the scheduler thread may change it meanwhile
+    countdowns = {task_id: _format_seconds_remaining(job.deadline - now)
+                  for task_id, job in tuple(_task_defs.items())}
+    _countdown_cache = (now, generation, countdowns)
+    return dict(countdowns)
 
 def list_tasks():
     """
@@ -214,43 +621,25 @@ def list_tasks():
               - "next_run_iso" (str | None): ISO formatted string of the next run datetime, or None.
               - "time_remaining_str" (str): Formatted countdown string (e.g., "01:23:45",
                                             "Running/Overdue", or "N/A").
-              - "job_str" (str): String representation of the schedule job object for debugging.
+              - "job_str" (str): String representation of the scheduled job for debugging.
     """
-    if not schedule.jobs:
-        print("DEBUG: scheduler.py -> list_tasks -> No jobs in schedule.jobs")
+    # Snapshotted in one step, as the scheduler thread may change the map meanwhile
+    scheduled = tuple(_task_defs.items())
+    if not scheduled:
+        logger.debug("list_tasks: no jobs scheduled")
         return [] # No jobs scheduled
 
-    tasks_info = []
-    now = datetime.datetime.now() # Current time, fetched once for consistency in calculations
-
-    print(f"DEBUG: scheduler.py -> list_tasks -> Current schedule.jobs: {schedule.jobs}")
-
-    for job in schedule.jobs:
-        if not job.tags: # Each job should be tagged with its task_id
-            print(f"Scheduler Warning: Found a job with no tags: {job}")
-            continue
-
-        task_id = list(job.tags)[0] # Assume the first tag is the unique task ID
-        next_run_dt = job.next_run  # datetime object for the next scheduled execution
-
-        time_remaining_str = "N/A" # Default if next_run_dt is None
-        if next_run_dt:
-            if next_run_dt > now: # If the next run is in the future
-                time_remaining = next_run_dt - now # timedelta object
-                total_seconds = int(time_remaining.total_seconds())
-                hours, remainder = divmod(total_seconds, 3600)
-                minutes, seconds = divmod(remainder, 60)
-                time_remaining_str = f"{hours:02}:{minutes:02}:{seconds:02}" # HH:MM:SS format
-            else: # If the next run is in the past or now
-                time_remaining_str = "Running/Overdue"
-
-        tasks_info.append({
-            "id": task_id,
-            "next_run_iso": next_run_dt.isoformat() if next_run_dt else None,
-            "time_remaining_str": time_remaining_str,
-            "job_str": str(job) # Useful for debugging the raw schedule job
-        })
-    return tasks_info
+    now = time.monotonic() # Current time, fetched once for consistency in calculations
+    return [_task_status(task_id, job, now) for task_id, job in scheduled]
+
+def seconds_until_next_run():
+    """
+    Returns the number of seconds until the next scheduled job is due (zero or negative if one
+    is overdue), or None if nothing is scheduled.
+    """
+    with _schedule_lock:
+        _discard_stale_heap_top()
+        return _heap[0][0] - time.monotonic() if _heap else None
 
 def get_task_status_by_id(task_id_to_find):
     """
@@ -264,59 +653,144 @@ def get_task_status_by_id(task_id_to_find):
         dict | None: A dictionary with task status details (similar to list_tasks items)
                       if found, otherwise None.
     """
-    for job in schedule.jobs:
-        if task_id_to_find in job.tags:
-            now = datetime.datetime.now()
-            next_run_dt = job.next_run
-            time_remaining_str = "N/A"
-            if next_run_dt:
-                if next_run_dt > now:
-                    time_remaining = next_run_dt - now
-                    total_seconds = int(time_remaining.total_seconds())
-                    hours, remainder = divmod(total_seconds, 3600)
-                    minutes, seconds = divmod(remainder, 60)
-                    time_remaining_str = f"{hours:02}:{minutes:02}:{seconds:02}"
-                else:
-                    time_remaining_str = "Running/Overdue"
-            return { # Return structure matches items from list_tasks
-                "id": task_id_to_find,
-                "next_run_iso": next_run_dt.isoformat() if next_run_dt else None,
-                "time_remaining_str": time_remaining_str,
-                "job_str": str(job)
-            }
-    return None # Task not found
+    job = _task_defs.get(task_id_to_find)
+    if job is None:
+        return None # Task not found
+    return _task_status(task_id_to_find, job, time.monotonic()) # Same structure as list_tasks items
 
 
+def is_running():
+    """Returns True while the scheduler thread is running. Never blocks."""
+    return _running.is_set()
+
+def post_command(command, *args):
+    """
+    Queues a command for the scheduler thread and returns immediately.
+    Supported commands:
+      ("remove", task_id) - unschedules the task (e.g. removed or disabled).
+      ("add", task_config, global_api_key, global_email_to, global_smtp_config) - schedules the
+          task (e.g. newly enabled), replacing any jobs it already has.
+    """
+    _command_queue.put((command, args))
+    _wake_event.set()
+
+def _post_event(event, task_id):
+    try:
+        _event_queue.put_nowait((event, task_id))
+    except queue.Full:
+        pass # Nobody is listening; the config on disk still has the task's latest results
+
+def poll_events():
+    """
+    Returns and clears the pending scheduler events, oldest first, without blocking.
+    Each event is an (event, task_id) tuple; currently only "task_ran", posted after a task
+    has run and its last-run details were recorded in the config.
+    """
+    events = []
+    while True:
+        try:
+            events.append(_event_queue.get_nowait())
+        except queue.Empty:
+            return events
+
+def _drain_commands():
+    """Applies all queued commands. Runs on the scheduler thread."""
+    while True:
+        try:
+            command, args = _command_queue.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            if command == "remove":
+                remove_task(*args)
+            elif command == "add":
+                task_config = args[0]
+                _add_task_from_config(task_config, *args[1:]) # Replaces any job the task already has
+            else:
+                logger.warning("Ignoring unknown command %r.", command)
+        except Exception as e:
+            # One bad command must not hold up the rest of the queue or this pass's due jobs
+            _log_exception(e, "Failed to apply scheduler command %r: %s: %s", command, type(e).__name__, e)
+
+def _discard_stale_heap_top():
+    """Pops entries of removed tasks off the top of _heap. Caller holds _schedule_lock."""
+    global _stale_heap_entries
+    while _heap and _task_defs.get(_heap[0][2].task_id) is not _heap[0][2]:
+        heapq.heappop(_heap)
+        _stale_heap_entries -= 1
+
+def _run_due_jobs():
+    """
+    Hands every job whose deadline has passed to _submit_task_run and reschedules it. Only due
+    jobs are touched: O(log N) each, with no scan over the rest. Caller holds _schedule_lock.
+    """
+    now = time.monotonic()
+    while True:
+        _discard_stale_heap_top()
+        if not _heap or _heap[0][0] > now:
+            return
+        deadline, _, job = _heap[0]
+        job.schedule_next(now, previous_deadline=deadline)
+        heapq.heapreplace(_heap, (job.deadline, next(_heap_sequence), job)) # Rescheduled before it runs
+        _submit_task_run(job.task_id, job.task_run)
+
 def _run_scheduler():
     """Target function for the scheduler thread."""
-    print("Scheduler: Scheduler thread started.")
+    try:
+        _scheduler_loop()
+    finally:
+        _running.clear() # Even if the loop dies unexpectedly, is_running() must not stay True
+
+def _scheduler_loop():
+    logger.info("Scheduler thread started.")
     _stop_event.clear()
+    error_backoff = 0 # Seconds to wait after the latest failed iteration; 0 once one succeeds
+    last_error_type = None
     while not _stop_event.is_set():
+        idle_seconds = None
         try:
-            schedule.run_pending()
+            with _schedule_lock:
+                _drain_commands()
+                _run_due_jobs()
+                _discard_stale_heap_top()
+                idle_seconds = _heap[0][0] - time.monotonic() if _heap else None
+            error_backoff, last_error_type = 0, None
         except Exception as e:
-            print(f"Scheduler Error: Exception in run_pending loop: {type(e).__name__}: {e}")
-            traceback.print_exc() # Print full traceback to console
+            _log_exception(e, "Exception in scheduler loop: %s: %s", type(e).__name__, e) # Full traceback unless a recent repeat
+            # Retry after a second, as the old one-second poll did, doubling the wait (up to the
+            # loop's upper bound) while the same error keeps coming back, so a persistent failure
+            # can't spin the loop
+            error_backoff = min(error_backoff * 2, _MAX_WAIT_SECONDS) if type(e) is last_error_type else 1
+            last_error_type = type(e)
+            idle_seconds = error_backoff
             # Depending on the severity or type of error, we might want to stop the scheduler.
             # For now, it will log and continue, which might lead to repeated errors if the cause persists.
             # Consider adding specific error handling or a flag to stop on repeated/critical errors.
 
-        # Detailed log for each loop iteration
-        is_stopped = _stop_event.is_set()
-        num_jobs = len(schedule.jobs)
-        # print(f"Scheduler DEBUG: Loop iteration. stop_event set? {is_stopped}, Current jobs in schedule: {num_jobs}")
-        # Reducing verbosity for now, enable if needed:
-        if num_jobs == 0 and not is_stopped:
-            print(f"Scheduler DEBUG: Loop iteration. stop_event set? {is_stopped}, No jobs in schedule. Next check in 1s.")
-
-
-        time.sleep(1) # Check for pending jobs every second
+        # Sleep until the next job is due instead of polling every second; stop requests,
+        # commands and new jobs set _wake_event and cut the sleep short. This is what keeps the
+        # loop cheap: it wakes when the job at the top of _heap is due, or for a command.
+        wait_seconds = _MAX_WAIT_SECONDS if idle_seconds is None else min(max(idle_seconds, _MIN_WAIT_SECONDS), _MAX_WAIT_SECONDS)
+        flush_due = _pending_last_runs_due
+        if flush_due is not None:
+            flush_in = flush_due - time.monotonic()
+            if flush_in <= 0:
+                _flush_last_runs()
+            else:
+                wait_seconds = min(wait_seconds, flush_in)
+        _close_idle_email_senders()
+        if not _stop_event.is_set():
+            _wake_event.wait(wait_seconds)
+            _wake_event.clear()
 
     # This part is reached when _stop_event is set
-    print("Scheduler: Scheduler thread stopping gracefully (loop condition met).")
-    schedule.clear() # Clear all jobs from the schedule instance
-    _jobs.clear() # Clear our internal list of job objects
-    print("Scheduler: All scheduled jobs cleared.")
+    logger.info("Scheduler thread stopping gracefully (loop condition met).")
+    _clear_jobs()
+    _shutdown_task_executor()
+    _flush_last_runs(final=True)
+    _close_email_senders()
+    _clear_gemini_clients()
+    logger.info("All scheduled jobs cleared.")
 
 # --- New function for immediate run and schedule ---
 def run_task_now_and_schedule(task_config, global_api_key, global_email_to, global_smtp_config):
@@ -327,6 +801,7 @@ def run_task_now_and_schedule(task_config, global_api_key, global_email_to, glob
     Args:
         task_config (dict): The configuration dictionary for the task.
                             Expected keys: "id", "prompt", "interval", "search_internet".
+                            Optional: "cache_ttl" (see _task_cache_ttl).
         global_api_key (str): The Gemini API key.
         global_email_to (str): The default recipient email address.
         global_smtp_config (dict): SMTP configuration details.
@@ -334,11 +809,15 @@ def run_task_now_and_schedule(task_config, global_api_key, global_email_to, glob
     Returns:
         bool: True if the task was successfully scheduled for future runs, False otherwise.
               The immediate execution part logs its own success/failure.
+
+    While the scheduler is running the immediate run goes to its task pool, like any due
+    task, and this returns without waiting for it; a "task_ran" event follows when it's done.
     """
     task_id = task_config.get("id")
     prompt = task_config.get("prompt")
     interval_str = task_config.get("interval")
     search_internet = task_config.get("search_internet", False)
+    cache_ttl = _task_cache_ttl(task_config)
 
     # Use task-specific API key and email if provided in task_config, otherwise use global
     # (Currently, task_config in this app doesn't store these overrides, but good for future)
@@ -346,53 +825,95 @@ def run_task_now_and_schedule(task_config, global_api_key, global_email_to, glob
     email_to_use = task_config.get("email_to", global_email_to)
 
     if not all([task_id, prompt, interval_str]):
-        print(f"Scheduler ERROR: Task {task_id} is missing required fields (prompt, interval) for run_task_now_and_schedule.")
+        logger.error("Task %s is missing required fields (prompt, interval) for run_task_now_and_schedule.", task_id)
         return False
 
-    print(f"Scheduler INFO: run_task_now_and_schedule called for task ID '{task_id}'. Performing immediate execution.")
+    logger.info("run_task_now_and_schedule called for task ID '%s'. Performing immediate execution.", task_id)
+    live = is_running() and threading.current_thread() is not _scheduler_thread
+    task_run = _bind_task_run(task_id, prompt, search_internet, email_to_use, api_key_to_use, global_smtp_config,
+                              cache_ttl)
     try:
-        # 1. Execute the task immediately
-        _task_execution_function(
-            task_id=task_id,
-            prompt=prompt,
-            search_internet=search_internet,
-            email_to=email_to_use,
-            api_key=api_key_to_use,
-            smtp_config=global_smtp_config
-        )
-        print(f"Scheduler INFO: Immediate execution of task '{task_id}' completed.")
+        # 1. Execute the task immediately: on the task pool if it's up, so the caller (the GUI
+        # thread) isn't blocked for the Gemini call and the send
+        if live:
+            _submit_task_run(task_id, task_run)
+            logger.info("Immediate execution of task '%s' queued.", task_id)
+        else:
+            task_run()
+            logger.info("Immediate execution of task '%s' completed.", task_id)
     except Exception as e:
         # _task_execution_function should ideally handle its own exceptions and log them.
         # This is a fallback catch.
-        print(f"Scheduler CRITICAL: Unexpected exception during immediate execution of task '{task_id}': {e}")
-        traceback.print_exc()
+        _log_exception(e, "Unexpected exception during immediate execution of task '%s': %s", task_id, e)
         # We might still try to schedule it, or return False. Let's try to schedule.
 
-    print(f"Scheduler INFO: Task '{task_id}' - Proceeding to schedule for future runs with interval '{interval_str}'.")
+    logger.debug("Task '%s' - Proceeding to schedule for future runs with interval '%s'.", task_id, interval_str)
     # 2. Schedule the task for future runs
-    # add_task returns True if scheduling (parsing interval and adding to schedule lib) was successful.
-    scheduled_successfully = add_task(
-        task_id=task_id,
-        prompt=prompt,
-        interval_str=interval_str,
-        search_internet=search_internet,
-        email_to=email_to_use,
-        api_key=api_key_to_use,
-        smtp_config=global_smtp_config
-    )
+    if live:
+        # Hand the job to the live scheduler thread, which owns changes to the running schedule.
+        # The interval is checked here so failures still surface to the caller.
+        scheduled_successfully = is_valid_interval(interval_str)
+        if scheduled_successfully:
+            post_command("add", dict(task_config), global_api_key, global_email_to, global_smtp_config)
+    else:
+        # add_task returns True if scheduling (parsing interval and adding the job) was successful.
+        scheduled_successfully = add_task(
+            task_id=task_id,
+            prompt=prompt,
+            interval_str=interval_str,
+            search_internet=search_internet,
+            email_to=email_to_use,
+            api_key=api_key_to_use,
+            smtp_config=global_smtp_config,
+            cache_ttl=cache_ttl
+        )
 
     if scheduled_successfully:
-        print(f"Scheduler INFO: Task '{task_id}' successfully scheduled for future runs.")
-        # If the scheduler thread is not running, the task is now in schedule.jobs
+        logger.info("Task '%s' successfully scheduled for future runs.", task_id)
+        # If the scheduler thread is not running, the task is now in _task_defs
         # and will be picked up when start_scheduler_thread is called (which clears and re-adds).
-        # If the scheduler thread IS running, add_task has added it to the live schedule.jobs list,
-        # and the running schedule.run_pending() loop will pick it up.
+        # If the scheduler thread IS running, the job was posted to it and it adds the job to the
+        # live schedule on its next tick.
     else:
-        print(f"Scheduler ERROR: Task '{task_id}' failed to schedule for future runs.")
+        logger.error("Task '%s' failed to schedule for future runs.", task_id)
 
     return scheduled_successfully
 
 
+def _task_cache_ttl(task_config):
+    """
+    A task's optional "cache_ttl": how many seconds a Gemini response to its prompt may be
+    reused instead of asking again (useful for fast intervals). Missing or invalid means 0,
+    so every run gets a fresh response.
+    """
+    try:
+        return max(0.0, float(task_config.get("cache_ttl") or 0))
+    except (TypeError, ValueError):
+        logger.warning("Task '%s' has an invalid cache_ttl %r. Caching disabled.", task_config.get("id"), task_config.get("cache_ttl"))
+        return 0.0
+
+def _add_task_from_config(task_config, global_api_key, global_email_to, global_smtp_config, default_id=None):
+    """Schedules one task dict from the config (see start_scheduler_thread)."""
+    # Assuming task_config has 'prompt' and 'interval'; 'search_internet' defaults to False
+    # And we use global settings for api_key, email_to (or task-specific if available)
+    task_id = task_config.get("id", default_id) # Generate an ID if not present
+
+    # Use task-specific API key and email if provided, otherwise global
+    api_key_to_use = task_config.get("api_key", global_api_key)
+    email_to_use = task_config.get("email_to", global_email_to)
+
+    return add_task(
+        task_id=task_id,
+        prompt=task_config["prompt"],
+        interval_str=task_config["interval"],
+        search_internet=task_config.get("search_internet", False),
+        email_to=email_to_use,
+        api_key=api_key_to_use,
+        smtp_config=global_smtp_config,
+        cache_ttl=_task_cache_ttl(task_config)
+    )
+
+
 def start_scheduler_thread(tasks_to_schedule, global_api_key, global_email_to, global_smtp_config):
     """
     Starts the scheduler in a separate thread.
@@ -400,69 +921,65 @@ def start_scheduler_thread(tasks_to_schedule, global_api_key, global_email_to, g
                        Each dict: {"id": "task_1", "prompt": "...", "interval": "...", ...}
     global_api_key, global_email_to, global_smtp_config: Configurations from the UI/config file.
     """
-    global _scheduler_thread, _stop_event
+    global _scheduler_thread, _stop_event, _task_executor, _batch_last_runs
 
-    if _scheduler_thread and _scheduler_thread.is_alive():
-        print("Scheduler: Scheduler is already running.")
+    if is_running():
+        logger.info("Scheduler is already running.")
         return
 
-    print("Scheduler: Starting scheduler...")
+    logger.info("Starting scheduler...")
     _stop_event = threading.Event() # Ensure a fresh event
 
     # Clear any previous jobs before starting
-    schedule.clear()
-    _jobs.clear()
+    _clear_jobs()
 
-    print(f"DEBUG: scheduler.py -> start_scheduler_thread -> Received tasks_to_schedule: {tasks_to_schedule}")
+    logger.debug("start_scheduler_thread: received tasks_to_schedule: %s", tasks_to_schedule)
 
     for i, task_config in enumerate(tasks_to_schedule):
-        # Assuming task_config has 'prompt', 'interval', 'search_internet'
-        # And we use global settings for api_key, email_to (or task-specific if available)
-        task_id = task_config.get("id", f"task_{i+1}") # Generate an ID if not present
-        
-        # Use task-specific API key and email if provided, otherwise global
-        api_key_to_use = task_config.get("api_key", global_api_key)
-        email_to_use = task_config.get("email_to", global_email_to)
-
-        add_task(
-            task_id=task_id,
-            prompt=task_config["prompt"],
-            interval_str=task_config["interval"],
-            search_internet=task_config["search_internet"],
-            email_to=email_to_use,
-            api_key=api_key_to_use,
-            smtp_config=global_smtp_config
-        )
+        _add_task_from_config(task_config, global_api_key, global_email_to, global_smtp_config,
+                              default_id=f"task_{i+1}")
     
-    if not _jobs:
-        print("Scheduler: No tasks provided to schedule.")
+    if not _task_defs:
+        logger.info("No tasks provided to schedule.")
         # Decide if we should start the thread anyway or not. For now, let's start it.
         # return
 
+    # Drop commands left over from a previous run; they referred to jobs cleared above
+    while not _command_queue.empty():
+        _command_queue.get_nowait()
+    _shutdown_task_executor() # In case a previous loop died before shutting its pool down
+    with _task_futures_lock:
+        _task_executor = ThreadPoolExecutor(max_workers=_TASK_WORKERS, thread_name_prefix="SchedulerTask")
+    with _last_run_lock:
+        _batch_last_runs = True
+    _running.set() # Set before starting so is_running() is accurate as soon as this returns
     _scheduler_thread = threading.Thread(target=_run_scheduler, daemon=True)
     _scheduler_thread.start()
 
 def stop_scheduler_thread():
     """Stops the scheduler thread."""
-    print("DEBUG: scheduler.py -> stop_scheduler_thread() CALLED") # DEBUG LOG
+    logger.debug("stop_scheduler_thread() called")
     global _scheduler_thread
     if _scheduler_thread and _scheduler_thread.is_alive():
-        print("Scheduler: Attempting to stop scheduler thread...")
+        logger.info("Attempting to stop scheduler thread...")
         _stop_event.set()
-        print(f"Scheduler DEBUG: _stop_event was set to {_stop_event.is_set()}")
+        _wake_event.set() # Interrupt the thread's sleep so it stops right away
+        logger.debug("_stop_event was set to %s", _stop_event.is_set())
         _scheduler_thread.join(timeout=5) # Wait for the thread to finish
         if _scheduler_thread.is_alive():
-            print("Scheduler: Thread did not stop in time.")
+            logger.warning("Thread did not stop in time.")
         else:
-            print("Scheduler: Thread stopped successfully.")
+            logger.info("Thread stopped successfully.")
         _scheduler_thread = None
-        schedule.clear() # Ensure all jobs are cleared
-        _jobs.clear()
+        _running.clear()
+        _clear_jobs() # Ensure all jobs are cleared, even if the thread didn't stop in time
+        _flush_last_runs(final=True) # Likewise for results the thread didn't get to write
     else:
-        print("Scheduler: Scheduler thread is not running.")
+        logger.info("Scheduler thread is not running.")
 
 if __name__ == '__main__':
     # Example Usage (for testing this module directly)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s: %(message)s")
     print("Testing Scheduler...")
 
     # Dummy config